@@ -1,4 +1,6 @@
 import random
+from disjoint_set import DisjointSet
+from maze_grid import MazeGrid
 
 HORIZONTAL = 0
 VERTICAL   = 1
@@ -6,41 +8,61 @@ VERTICAL   = 1
 class KruskalMaze:
     def __init__(self, rows, cols):
         self.rows, self.cols = rows, cols
-        self.area = [[1]*cols for _ in range(rows)]
-        self.sets = [[0]*cols for _ in range(rows)]
+        self.area = MazeGrid(rows, cols)
+        # Un conjunto por celda de coordenadas impares (las únicas que se
+        # unen), indexada como (y//2)*width + x//2
+        self.width = (cols-1)//2
+        self.sets = DisjointSet(((rows-1)//2) * self.width)
+        # Cambios (y, x, valor) pendientes de entregar; None si no se animan
+        self.changes = None
 
-    def generate(self):
-        edges, set_id = [], 1
+    def edges(self):
+        """Lista barajada de paredes candidatas (y, x, orientación)"""
+        edges = []
         for y in range(1, self.rows-1, 2):
             for x in range(1, self.cols-1, 2):
-                self.sets[y][x] = set_id; set_id += 1
                 if y+2 < self.rows-1: edges.append((y, x, VERTICAL))
                 if x+2 < self.cols-1: edges.append((y, x, HORIZONTAL))
         random.shuffle(edges)
+        return edges
 
-        yield self.area
+    def join(self, y, x, ori):
+        """Abre el paso desde (y, x) si une dos conjuntos distintos"""
+        cols, data = self.cols, self.area.data
+        i = y*cols + x
+        c = (y//2)*self.width + x//2
+        if ori == HORIZONTAL:
+            if self.sets.union(c, c+1):
+                data[i] = data[i+1] = data[i+2] = 0
+                if self.changes is not None:
+                    self.changes += ((y, x, 0), (y, x+1, 0), (y, x+2, 0))
+                return True
+        else:
+            if self.sets.union(c, c + self.width):
+                data[i] = data[i+cols] = data[i + 2*cols] = 0
+                if self.changes is not None:
+                    self.changes += ((y, x, 0), (y+1, x, 0), (y+2, x, 0))
+                return True
+        return False
 
-        for y, x, ori in edges:
-            if ori == HORIZONTAL:
-                y2, x2 = y, x+2
-                if self.sets[y][x] != self.sets[y2][x2]:
-                    old, new = self.sets[y2][x2], self.sets[y][x]
-                    for yy in range(1, self.rows-1, 2):
-                        for xx in range(1, self.cols-1, 2):
-                            if self.sets[yy][xx] == old:
-                                self.sets[yy][xx] = new
-                    for dx in range(3):
-                        self.area[y][x+dx] = 0
-                    yield self.area
+    def build(self):
+        """Genera el laberinto completo sin pasos intermedios y lo devuelve"""
+        join = self.join
+        for y, x, ori in self.edges():
+            join(y, x, ori)
+        return self.area
 
-            else:
-                y2, x2 = y+2, x
-                if self.sets[y][x] != self.sets[y2][x2]:
-                    old, new = self.sets[y2][x2], self.sets[y][x]
-                    for yy in range(1, self.rows-1, 2):
-                        for xx in range(1, self.cols-1, 2):
-                            if self.sets[yy][xx] == old:
-                                self.sets[yy][xx] = new
-                    for dy in range(3):
-                        self.area[y+dy][x] = 0
-                    yield self.area
+    def generate(self, step=1):
+        """Genera el laberinto entregando cada `step` pasos la lista de
+        celdas modificadas como tuplas (y, x, valor)"""
+        self.changes = []
+        carved = 0
+        for y, x, ori in self.edges():
+            if self.join(y, x, ori):
+                carved += 1
+                if carved % step == 0:
+                    yield self.changes
+                    self.changes = []
+        if self.changes:
+            yield self.changes
+        self.changes = None
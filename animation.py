@@ -0,0 +1,168 @@
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+import pygame
+
+_DONE = object()  # Marca de fin en la cola de un BackgroundTask
+
+# Eventos tras los que hay que volver a presentar la ventana; WINDOWEXPOSED
+# solo existe desde pygame 2, en pygame 1 basta VIDEOEXPOSE
+_EXPOSE_EVENTS = {pygame.VIDEOEXPOSE, getattr(pygame, "WINDOWEXPOSED", pygame.VIDEOEXPOSE)}
+
+
+class BackgroundTask:
+    """Ejecuta fn(emit, *args) en un hilo aparte.
+
+    Cada emit(item) envía un paso de progreso a la interfaz por una cola
+    acotada (si la interfaz se retrasa, el hilo espera en lugar de acumular
+    pasos sin límite). El hilo de pygame consume la cola con poll() sin
+    bloquearse y recoge el valor devuelto por fn con result().
+    """
+
+    def __init__(self, fn: Callable, *args, maxsize: int = 4096):
+        self.queue: queue.Queue = queue.Queue(maxsize)
+        self.finished = False
+        self._result = self._error = None
+        self._thread = threading.Thread(target=self._run, args=(fn, args), daemon=True)
+        self._thread.start()
+
+    def _run(self, fn, args):
+        try:
+            self._result = fn(self.queue.put, *args)
+        except BaseException as e:
+            self._error = e
+        finally:
+            self.queue.put(_DONE)
+
+    def poll(self) -> Iterator:
+        """Pasos ya disponibles en la cola, sin esperar a los siguientes"""
+        while not self.finished:
+            try:
+                item = self.queue.get_nowait()
+            except queue.Empty:
+                return
+            if item is _DONE:
+                self.finished = True
+                return
+            yield item
+
+    def result(self):
+        """Espera a que termine el hilo y devuelve el resultado de fn
+        (o relanza su excepción)"""
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def wait_for_quit():
+    """Mantiene la ventana abierta hasta que el usuario la cierre.
+
+    Duerme en pygame.event.wait en lugar de sondear los eventos, así que
+    una ventana estática no consume CPU.
+    """
+    while True:
+        evt = pygame.event.wait()
+        if evt.type == pygame.QUIT:
+            return
+        if evt.type in _EXPOSE_EVENTS:
+            pygame.display.flip()
+
+
+class FrameScheduler:
+    """Anima una secuencia de pasos a un ritmo de frames fijo.
+
+    En cada frame aplica hasta per_frame pasos (o todos los que quepan en el
+    presupuesto de tiempo del frame si per_frame es None), atiende los
+    eventos, presenta el frame y espera con pygame.time.Clock hasta el
+    siguiente. Así la duración de la animación no depende del coste de cada
+    paso y la ventana sigue respondiendo. Con max_duration, al agotarse ese
+    tiempo se aplican los pasos restantes sin presentar frames intermedios.
+    """
+
+    def __init__(self, fps: int = 60, max_duration: Optional[float] = None):
+        self.fps, self.max_duration = fps, max_duration
+        # Fracción del frame dedicada a aplicar pasos; el resto es para presentar
+        self.budget = 0.75 / fps
+        self.clock = pygame.time.Clock()
+
+    def run(
+        self,
+        steps: Iterable,
+        apply: Callable[[object], None],
+        present: Callable[[], None],
+        per_frame: Optional[int] = None,
+        total: Optional[int] = None
+    ) -> bool:
+        """Consume steps llamando a apply con cada uno y a present una vez por frame.
+
+        Si se conoce el total de pasos y hay max_duration, per_frame se
+        aumenta lo necesario para terminar a tiempo. Devuelve False si el
+        usuario cerró la ventana.
+        """
+        if total and self.max_duration and per_frame is not None:
+            frames = max(int(self.fps * self.max_duration), 1)
+            per_frame = max(per_frame, -(-total // frames))
+        deadline = None if self.max_duration is None else time.perf_counter() + self.max_duration
+        clock, budget = self.clock, self.budget
+        it = iter(steps)
+        done = False
+        while not done:
+            frame_end = time.perf_counter() + budget
+            if deadline is not None and frame_end > deadline:
+                # Sin tiempo para animar: aplicar el resto de una vez
+                for step in it:
+                    apply(step)
+                done = True
+            else:
+                n = 0
+                for step in it:
+                    apply(step)
+                    n += 1
+                    if n == per_frame or time.perf_counter() >= frame_end:
+                        break
+                else:
+                    done = True
+            for evt in pygame.event.get():
+                if evt.type == pygame.QUIT:
+                    return False
+            present()
+            clock.tick(self.fps)
+        return True
+
+    def follow(
+        self,
+        task: BackgroundTask,
+        apply: Callable[[object], None],
+        present: Callable[[], None],
+        per_frame: Optional[int] = None
+    ) -> bool:
+        """Como run, pero los pasos llegan de un BackgroundTask mientras se producen.
+
+        Cada frame aplica los pasos disponibles (hasta per_frame o hasta
+        agotar el presupuesto), atiende los eventos, presenta y duerme con
+        Clock.tick hasta el siguiente; si el hilo aún no ha producido nada,
+        el frame solo atiende eventos. Pasado max_duration se aplican todos
+        los pasos disponibles en cada frame. Devuelve False si el usuario
+        cerró la ventana.
+        """
+        deadline = None if self.max_duration is None else time.perf_counter() + self.max_duration
+        clock, budget = self.clock, self.budget
+        while True:
+            frame_end = time.perf_counter() + budget
+            late = deadline is not None and frame_end > deadline
+            n = 0
+            for step in task.poll():
+                apply(step)
+                n += 1
+                if not late and (n == per_frame or time.perf_counter() >= frame_end):
+                    break
+            for evt in pygame.event.get():
+                if evt.type == pygame.QUIT:
+                    return False
+            present()
+            if task.finished:
+                return True
+            clock.tick(self.fps)
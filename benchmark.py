@@ -0,0 +1,233 @@
+"""Banco de pruebas reproducible de generadores y algoritmos de búsqueda.
+
+Ejemplos:
+    python benchmark.py --out resultados.json
+    python benchmark.py --sizes 45x55 300x300 --baseline resultados.json
+    python benchmark.py --scaling --generators kruskal
+"""
+import argparse
+import json
+import math
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from Kruskal import KruskalMaze
+from prim import PrimMaze
+from search import ALGORITHMS, Adjacency, adjacency
+
+SIZES = [(45, 55), (100, 100), (300, 300), (1000, 1000), (2000, 2000), (4000, 4000)]
+GENERATORS = {"kruskal": KruskalMaze, "prim": PrimMaze}
+SOLVERS = ["bfs", "dfs", "ucs", "astar"]
+SEED = 123
+THRESHOLD = 0.10  # Empeoramiento relativo a partir del cual se marca una regresión
+MIN_TIME = 0.005  # Por debajo de este tiempo (s) las diferencias se consideran ruido
+SCALING_SIZES = [(100, 100), (250, 250), (500, 500), (1000, 1000), (2000, 2000), (4000, 4000)]
+MAX_EXPONENT = 1.25  # Exponente de t ~ celdas^k a partir del cual la generación no es casi lineal
+
+
+def measure(fn: Callable[[], object], repeat: int, memory: bool) -> Tuple[float, Optional[int], object]:
+    """Mejor tiempo de repeat ejecuciones y pico de memoria de una ejecución aparte.
+
+    La memoria se mide en una ejecución separada porque tracemalloc
+    ralentiza mucho el código y falsearía los tiempos.
+    """
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak, result
+
+
+def free_endpoints(grid) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Primera y última celda libre del laberinto (extremos fijos y alejados)"""
+    data = grid.data
+    first = data.index(0)
+    last = len(data) - 1 - data[::-1].index(0)
+    return grid.coords(first), grid.coords(last)
+
+
+def record(results: List[Dict], case: str, rows: int, cols: int, elapsed: float, peak, nodes: int):
+    entry = {
+        "case": case, "rows": rows, "cols": cols,
+        "time": elapsed, "nodes": nodes,
+        "nodes_per_sec": nodes / elapsed if elapsed > 0 else None,
+        "peak_bytes": peak,
+    }
+    results.append(entry)
+    mem = "-" if peak is None else f"{peak / 2**20:.1f} MiB"
+    print(f"{case:<16} {rows:>5}x{cols:<5} {elapsed:9.4f}s {nodes:>10} nodos  {mem}", flush=True)
+
+
+def meta(seed: int, repeat: int) -> Dict:
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+
+def run(
+    sizes: List[Tuple[int, int]] = SIZES,
+    solvers: List[str] = SOLVERS,
+    seed: int = SEED,
+    repeat: int = 3,
+    memory: bool = True,
+    generators: List[str] = list(GENERATORS)
+) -> Dict:
+    """Ejecuta el barrido completo y devuelve el informe (serializable a JSON)"""
+    results: List[Dict] = []
+    for rows, cols in sizes:
+        cells = rows * cols
+        grid = None
+        for name in generators:
+            cls = GENERATORS[name]
+            def generate():
+                random.seed(seed)
+                return cls(rows, cols).build()
+            elapsed, peak, maze = measure(generate, repeat, memory)
+            record(results, f"gen:{name}", rows, cols, elapsed, peak, cells)
+            if grid is None:
+                grid = maze
+
+        # Los algoritmos se miden sobre el laberinto de Kruskal; la lista de
+        # adyacencia se construye (y se mide) una vez porque queda cacheada
+        elapsed, peak, _ = measure(lambda: Adjacency(grid), 1, memory)
+        record(results, "adjacency", rows, cols, elapsed, peak, cells)
+        adjacency(grid)
+        start, goal = free_endpoints(grid)
+        for key in solvers:
+            _, fn = ALGORITHMS[key]
+            elapsed, peak, (path, nodes) = measure(lambda: fn(grid, start, goal), repeat, memory)
+            record(results, f"solve:{key}", rows, cols, elapsed, peak, nodes)
+
+    return {"meta": meta(seed, repeat), "results": results}
+
+
+def fit_exponent(points: List[Tuple[int, float]]) -> float:
+    """Pendiente de la recta de mínimos cuadrados de log(tiempo) frente a log(celdas)"""
+    xs = [math.log(n) for n, _ in points]
+    ys = [math.log(t) for _, t in points]
+    mx, my = sum(xs) / len(xs), sum(ys) / len(ys)
+    return (sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+            / sum((x - mx) ** 2 for x in xs))
+
+
+def scaling(
+    generators: List[str] = list(GENERATORS),
+    sizes: List[Tuple[int, int]] = SCALING_SIZES,
+    seed: int = SEED,
+    repeat: int = 1
+) -> Dict:
+    """Mide cómo crece el tiempo de generación con el número de celdas.
+
+    Para cada generador ajusta el exponente k de t ~ celdas^k en escala
+    log-log: k = 1 es crecimiento lineal y el antiguo reetiquetado de
+    conjuntos de Kruskal daba k cercano a 2.
+    """
+    results: List[Dict] = []
+    exponents: Dict[str, float] = {}
+    for name in generators:
+        cls = GENERATORS[name]
+        points = []
+        for rows, cols in sizes:
+            def generate():
+                random.seed(seed)
+                return cls(rows, cols).build()
+            elapsed, _, _ = measure(generate, repeat, False)
+            cells = rows * cols
+            record(results, f"scale:{name}", rows, cols, elapsed, None, cells)
+            points.append((cells, elapsed))
+        exponents[name] = fit_exponent(points)
+        print(f"{name}: t ~ celdas^{exponents[name]:.2f}  "
+              f"({points[-1][1] / points[-1][0] * 1e6:.2f} us/celda en {sizes[-1][0]}x{sizes[-1][1]}, "
+              f"{points[0][1] / points[0][0] * 1e6:.2f} us/celda en {sizes[0][0]}x{sizes[0][1]})", flush=True)
+    return {"meta": meta(seed, repeat), "results": results, "exponents": exponents}
+
+
+def compare(report: Dict, baseline: Dict, threshold: float = THRESHOLD) -> List[str]:
+    """Compara con un informe anterior y devuelve las regresiones encontradas"""
+    previous = {(r["case"], r["rows"], r["cols"]): r for r in baseline["results"]}
+    regressions = []
+    print("\n=== Comparación con la línea base ===")
+    for r in report["results"]:
+        old = previous.get((r["case"], r["rows"], r["cols"]))
+        if old is None:
+            continue
+        label = f"{r['case']} {r['rows']}x{r['cols']}"
+        for metric in ("time", "peak_bytes"):
+            new_value, old_value = r[metric], old.get(metric)
+            if not new_value or not old_value:
+                continue
+            ratio = new_value / old_value
+            mark = ""
+            noise = metric == "time" and new_value < MIN_TIME
+            if ratio > 1 + threshold and not noise:
+                mark = "  <-- REGRESIÓN"
+                regressions.append(f"{label} {metric}: x{ratio:.2f}")
+            print(f"{label:<28} {metric:<10} x{ratio:5.2f}{mark}")
+        if r["nodes"] != old["nodes"] and r["case"].startswith("solve:"):
+            regressions.append(f"{label} nodes: {old['nodes']} -> {r['nodes']}")
+            print(f"{label:<28} nodos {old['nodes']} -> {r['nodes']}  <-- CAMBIO")
+    return regressions
+
+
+def parse_size(text: str) -> Tuple[int, int]:
+    rows, cols = text.lower().split("x")
+    return int(rows), int(cols)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banco de pruebas de generadores y algoritmos")
+    parser.add_argument("--sizes", nargs="+", type=parse_size,
+                        help="tamaños FILASxCOLUMNAS (por defecto, de 45x55 a 4000x4000; "
+                             "con --scaling, de 100x100 a 4000x4000)")
+    parser.add_argument("--solvers", nargs="+", default=SOLVERS, choices=sorted(ALGORITHMS))
+    parser.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=sorted(GENERATORS))
+    parser.add_argument("--scaling", action="store_true",
+                        help="solo medir la escala de la generación y fallar si no es casi lineal")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--repeat", type=int, default=3, help="repeticiones por caso (se toma la mejor)")
+    parser.add_argument("--no-memory", action="store_true", help="no medir el pico de memoria")
+    parser.add_argument("--out", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para detectar regresiones")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="empeoramiento relativo tolerado (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.scaling:
+        report = scaling(args.generators, args.sizes or SCALING_SIZES, args.seed, args.repeat)
+        if args.out:
+            with open(args.out, "w") as f:
+                json.dump(report, f, indent=2)
+        slow = {name: k for name, k in report["exponents"].items() if k > MAX_EXPONENT}
+        if slow:
+            print("\nCrecimiento peor que casi lineal:\n  " + "\n  ".join(
+                f"{name}: k = {k:.2f} > {MAX_EXPONENT}" for name, k in slow.items()))
+            sys.exit(1)
+        sys.exit(0)
+
+    report = run(args.sizes or SIZES, args.solvers, args.seed, args.repeat, not args.no_memory,
+                 args.generators)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print("\nRegresiones:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
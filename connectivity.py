@@ -0,0 +1,107 @@
+from array import array
+from collections import deque
+from typing import List, Tuple
+
+from maze_grid import FingerprintCache, Grid, MazeGrid, as_grid
+from search import adjacency
+
+
+class Components:
+    """Componentes conexas de las celdas libres, etiquetadas con un único recorrido.
+
+    label[i] es el número de componente de la celda libre i (índice plano)
+    o -1 si es pared; sizes[c] es el número de celdas de la componente c.
+    """
+
+    def __init__(self, grid: MazeGrid):
+        adj = adjacency(grid)
+        offsets, targets = adj.offsets, adj.targets
+        self.cols = grid.cols
+        self.label = label = array('i', [-1]) * adj.size
+        self.sizes = array('i')
+        data = grid.data
+        for root in range(adj.size):
+            if data[root] != 0 or label[root] >= 0:
+                continue
+            c = len(self.sizes)
+            label[root] = c
+            queue = [root]
+            for u in queue:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if label[v] < 0:
+                        label[v] = c
+                        queue.append(v)
+            self.sizes.append(len(queue))
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def of(self, cell: Tuple[int, int]) -> int:
+        """Componente de la celda (y, x), o -1 si es pared"""
+        return self.label[cell[0] * self.cols + cell[1]]
+
+
+_components_cache = FingerprintCache(Components)
+
+
+def components(grid: Grid) -> Components:
+    """Componentes del laberinto, cacheadas por la huella de su contenido"""
+    return _components_cache.get(as_grid(grid))
+
+
+def connected(grid: Grid, a: Tuple[int, int], b: Tuple[int, int]) -> bool:
+    """True si a y b son celdas libres de la misma componente"""
+    comp = components(grid)
+    ca = comp.of(a)
+    return ca >= 0 and ca == comp.of(b)
+
+
+def connect(grid: MazeGrid, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Abre el mínimo número de paredes para unir start con goal.
+
+    Búsqueda 0-1 (deque) donde entrar en una celda libre cuesta 0 y en una
+    pared 1, sin usar el borde exterior del laberinto. Modifica grid en el
+    sitio y devuelve las celdas abiertas ([] si ya estaban conectadas).
+    """
+    rows, cols, data = grid.rows, grid.cols, grid.data
+    size = rows * cols
+    source, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+    dist = array('i', [-1]) * size
+    parent = array('i', [-1]) * size
+    dist[source] = data[source] != 0
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        if u == target:
+            break
+        y, x = divmod(u, cols)
+        for v, ok in ((u - cols, y > 0), (u + cols, y < rows - 1),
+                      (u - 1, x > 0), (u + 1, x < cols - 1)):
+            if not ok:
+                continue
+            w = data[v] != 0
+            if w:
+                vy, vx = divmod(v, cols)
+                if not (0 < vy < rows - 1 and 0 < vx < cols - 1):
+                    continue  # el borde exterior no se abre
+            d = dist[u] + w
+            if dist[v] < 0 or d < dist[v]:
+                dist[v], parent[v] = d, u
+                if w:
+                    queue.append(v)
+                else:
+                    queue.appendleft(v)
+
+    carved = []
+    if dist[target] < 0:
+        return carved
+    v = target
+    while True:
+        if data[v] != 0:
+            data[v] = 0
+            carved.append(divmod(v, cols))
+        if v == source:
+            break
+        v = parent[v]
+    carved.reverse()
+    return carved
@@ -0,0 +1,32 @@
+from array import array
+
+
+class DisjointSet:
+    """Conjuntos disjuntos (union-find) sobre un arreglo plano indexado por celda"""
+
+    def __init__(self, size: int):
+        self.parent = array('i', range(size))
+        self.rank = bytearray(size)
+
+    def find(self, i: int) -> int:
+        """Devuelve el representante de i comprimiendo el camino recorrido"""
+        parent = self.parent
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        while parent[i] != root:
+            parent[i], i = root, parent[i]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """Une los conjuntos de a y b por rango; False si ya estaban unidos"""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        rank = self.rank
+        if rank[ra] < rank[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        if rank[ra] == rank[rb]:
+            rank[ra] += 1
+        return True
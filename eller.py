@@ -0,0 +1,108 @@
+import random
+from array import array
+from typing import Dict, Iterator, List
+
+from maze_file import save_rows
+from maze_grid import MazeGrid
+
+
+class EllerMaze:
+    """Generador de laberintos perfectos fila a fila (algoritmo de Eller).
+
+    Usa la misma disposición que Kruskal y Prim: celdas en coordenadas
+    impares y paredes entre ellas. Solo guarda el conjunto de cada columna
+    de la fila actual, así que la memoria es O(cols) y las filas se pueden
+    volcar a un archivo o a la pantalla a medida que se producen.
+    """
+
+    def __init__(self, rows, cols):
+        self.rows, self.cols = rows, cols
+
+    def iter_rows(self) -> Iterator[bytearray]:
+        """Produce las filas del laberinto en orden (1 byte por celda).
+
+        La fila entregada se reutiliza en el siguiente paso: quien la
+        necesite después debe copiarla.
+        """
+        rows, cols = self.rows, self.cols
+        xs = range(1, cols-1, 2)
+        n = len(xs)
+        cell_rows = range(1, rows-1, 2)
+        last = cell_rows[-1] if n and len(cell_rows) else -1
+
+        row = bytearray([1]) * cols
+        yield row
+        # Conjunto de cada columna; 0 = celda aún sin conjunto
+        labels = array('i', [0]) * n
+        next_label = 1
+        y = 1
+        while y <= last:
+            for j in range(n):
+                if labels[j] == 0:
+                    labels[j] = next_label
+                    next_label += 1
+
+            # Uniones horizontales al azar (todas las posibles en la última fila)
+            members: Dict[int, List[int]] = {}
+            for j in range(n):
+                members.setdefault(labels[j], []).append(j)
+            row[:] = b"\x01" * cols
+            for j in range(n):
+                row[xs[j]] = 0
+            for j in range(n - 1):
+                a, b = labels[j], labels[j+1]
+                if a != b and (y == last or random.random() < 0.5):
+                    row[xs[j] + 1] = 0
+                    if len(members[a]) < len(members[b]):
+                        a, b = b, a
+                    for k in members[b]:
+                        labels[k] = a
+                    members[a] += members.pop(b)
+            yield row
+
+            # Bajadas: al menos una por conjunto; el resto de columnas queda libre
+            row[:] = b"\x01" * cols
+            if y != last:
+                down = bytearray(n)
+                for cells in members.values():
+                    chosen = [k for k in cells if random.random() < 0.5]
+                    if not chosen:
+                        chosen = [random.choice(cells)]
+                    for k in chosen:
+                        down[k] = 1
+                for j in range(n):
+                    if down[j]:
+                        row[xs[j]] = 0
+                    else:
+                        labels[j] = 0
+            yield row
+            y += 2
+
+        # Filas de pared restantes (borde inferior)
+        row[:] = b"\x01" * cols
+        for _ in range(y, rows):
+            yield row
+
+    def build(self):
+        """Genera el laberinto completo en memoria y lo devuelve"""
+        area = MazeGrid(self.rows, self.cols)
+        data, cols = area.data, self.cols
+        for y, row in enumerate(self.iter_rows()):
+            data[y*cols:(y+1)*cols] = row
+        return area
+
+    def generate(self, step=1):
+        """Genera el laberinto entregando cada `step` filas la lista de
+        celdas abiertas como tuplas (y, x, valor)"""
+        changes = []
+        for y, row in enumerate(self.iter_rows()):
+            changes += ((y, x, 0) for x, v in enumerate(row) if v == 0)
+            if (y + 1) % step == 0 and changes:
+                yield changes
+                changes = []
+        if changes:
+            yield changes
+
+    def save(self, path, seed=None):
+        """Escribe el laberinto en formato maze_file sin tenerlo entero en memoria"""
+        save_rows(path, self.rows, self.cols, self.iter_rows(), "eller", seed)
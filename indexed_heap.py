@@ -0,0 +1,79 @@
+from typing import List
+
+
+class IndexedHeap:
+    """Heap binario de mínimos sobre los elementos 0..n-1 con decrease-key.
+
+    Cada elemento ocupa como mucho una posición del heap: pos[i] es su
+    índice en items, -1 si aún no ha entrado y -2 si ya salió. push sobre
+    un elemento que ya está solo rebaja su prioridad, así que el heap nunca
+    tiene más entradas que la frontera abierta y no hay entradas obsoletas
+    que descartar al sacar. Las búsquedas usan prioridades enteras únicas
+    (con la celda empaquetada en los bits bajos) para que no haya empates;
+    cualquier valor comparable sirve.
+    """
+
+    __slots__ = ("items", "keys", "pos")
+
+    def __init__(self, n: int):
+        self.items: List[int] = []
+        self.keys: list = []
+        # Lista y no array('i'): en el bucle de sift las lecturas y escrituras
+        # de una lista son bastante más rápidas
+        self.pos: List[int] = [-1] * n
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def push(self, item: int, key) -> bool:
+        """Inserta item o rebaja su prioridad a key.
+
+        Devuelve False (sin cambiar nada) si item ya salió del heap o si key
+        no mejora su prioridad actual.
+        """
+        pos, items, keys = self.pos, self.items, self.keys
+        i = pos[item]
+        if i == -2:
+            return False
+        if i < 0:
+            i = len(items)
+            items.append(item)
+            keys.append(key)
+        elif key >= keys[i]:
+            return False
+        # Subir: los padres con prioridad mayor bajan un nivel
+        while i:
+            parent = (i - 1) >> 1
+            parent_key = keys[parent]
+            if parent_key <= key:
+                break
+            moved = items[parent]
+            items[i], keys[i], pos[moved] = moved, parent_key, i
+            i = parent
+        items[i], keys[i], pos[item] = item, key, i
+        return True
+
+    def pop(self) -> int:
+        """Saca el elemento de menor prioridad y lo marca como cerrado"""
+        pos, items, keys = self.pos, self.items, self.keys
+        top = items[0]
+        pos[top] = -2
+        item, key = items.pop(), keys.pop()
+        n = len(items)
+        if n:
+            # Bajar el último elemento desde la raíz
+            i = 0
+            child = 1
+            while child < n:
+                child_key = keys[child]
+                right = child + 1
+                if right < n and keys[right] < child_key:
+                    child, child_key = right, keys[right]
+                if key <= child_key:
+                    break
+                moved = items[child]
+                items[i], keys[i], pos[moved] = moved, child_key, i
+                i = child
+                child = 2 * i + 1
+            items[i], keys[i], pos[item] = item, key, i
+        return top
@@ -0,0 +1,216 @@
+import heapq
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+from maze_grid import FingerprintCache, Grid, MazeGrid, as_grid
+from search import adjacency, bfs
+
+
+class JunctionGraph:
+    """Grafo de cruces de un laberinto.
+
+    Los nodos son las celdas libres con grado distinto de 2 (cruces y
+    callejones sin salida); cada pasillo entre dos nodos se contrae en una
+    arista con peso igual a su longitud. Para cada celda de pasillo se
+    guarda su arista y su posición dentro de ella, de modo que start y goal
+    se enlazan al grafo en O(1).
+    """
+
+    def __init__(self, grid: MazeGrid):
+        adj = adjacency(grid)
+        offsets, targets = adj.offsets, adj.targets
+        data, size = grid.data, adj.size
+        self.rows, self.cols = grid.rows, grid.cols
+        self.offsets, self.targets = offsets, targets
+
+        self.node_of = array('i', [-1]) * size
+        self.nodes = array('i')
+        self.node_y, self.node_x = array('i'), array('i')
+        for i in range(size):
+            if data[i] == 0 and offsets[i + 1] - offsets[i] != 2:
+                self.node_of[i] = len(self.nodes)
+                self.nodes.append(i)
+                self.node_y.append(i // grid.cols)
+                self.node_x.append(i % grid.cols)
+
+        # Aristas: nodos extremos, peso y primera celda del pasillo desde u
+        self.edge_u, self.edge_v = array('i'), array('i')
+        self.weight, self.first = array('i'), array('i')
+        self.edge_of = array('i', [-1]) * size
+        self.edge_pos = array('i', [0]) * size
+        # Por nodo: lista de (vecino, peso, tramo) con tramo = (arista, desde, hasta)
+        self.links: List[List[Tuple[int, int, Tuple[int, int, int]]]] = [[] for _ in self.nodes]
+
+        node_of, edge_of, edge_pos = self.node_of, self.edge_of, self.edge_pos
+        for u, cell in enumerate(self.nodes):
+            for k in range(offsets[cell], offsets[cell + 1]):
+                prev, cur = cell, targets[k]
+                if edge_of[cur] >= 0 or (node_of[cur] >= 0 and node_of[cur] < u):
+                    continue  # pasillo ya recorrido desde el otro extremo
+                e, length = len(self.weight), 1
+                while node_of[cur] < 0:
+                    edge_of[cur], edge_pos[cur] = e, length
+                    a, b = targets[offsets[cur]], targets[offsets[cur] + 1]
+                    prev, cur = cur, (b if a == prev else a)
+                    length += 1
+                v = node_of[cur]
+                self.edge_u.append(u)
+                self.edge_v.append(v)
+                self.weight.append(length)
+                self.first.append(targets[k])
+                self.links[u].append((v, length, (e, 0, length)))
+                if v != u:
+                    self.links[v].append((u, length, (e, length, 0)))
+
+    def edge_cells(self, e: int) -> List[int]:
+        """Celdas (índices planos) de la arista e, de su nodo u a su nodo v.
+
+        La celda de pasillo en la posición k queda en el índice k.
+        """
+        offsets, targets = self.offsets, self.targets
+        cells = [self.nodes[self.edge_u[e]]]
+        prev, cur = cells[0], self.first[e]
+        for _ in range(self.weight[e] - 1):
+            cells.append(cur)
+            a, b = targets[offsets[cur]], targets[offsets[cur] + 1]
+            prev, cur = cur, (b if a == prev else a)
+        cells.append(cur)
+        return cells
+
+    def _links(self, cell: int) -> List[Tuple[int, int, int, int, int]]:
+        """Enlaces (vértice, peso, arista, posición, extremo) de una celda al grafo"""
+        node = self.node_of[cell]
+        if node >= 0:
+            return [(node, 0, -1, 0, 0)]
+        e = self.edge_of[cell]
+        if e < 0:
+            return []
+        k, w = self.edge_pos[cell], self.weight[e]
+        return [(self.edge_u[e], k, e, k, 0), (self.edge_v[e], w - k, e, k, w)]
+
+    def query(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional["JunctionPath"]:
+        """Camino más corto entre start y goal sobre el grafo contraído (A*).
+
+        Devuelve None si alguno de los extremos no está en el grafo (pared o
+        ciclo sin cruces); el recorrido celda a celda se obtiene después con
+        JunctionPath.cells().
+        """
+        cols = self.cols
+        source, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+        if source == target:
+            return JunctionPath(self, [], 0, 1, source)
+        src_links, dst_links = self._links(source), self._links(target)
+        if not src_links or not dst_links:
+            return None
+
+        # Vértices virtuales para start (S) y goal (T) cuando están en un pasillo
+        n = len(self.nodes)
+        S = src_links[0][0] if src_links[0][2] < 0 else n
+        T = dst_links[0][0] if dst_links[0][2] < 0 else n + 1
+        extra: Dict[int, List[Tuple[int, int, Tuple[int, int, int]]]] = {}
+        if S == n:
+            for node, w, e, k, end in src_links:
+                extra.setdefault(S, []).append((node, w, (e, k, end)))
+        if T == n + 1:
+            for node, w, e, k, end in dst_links:
+                extra.setdefault(node, []).append((T, w, (e, end, k)))
+        if S == n and T == n + 1 and self.edge_of[source] == self.edge_of[target]:
+            e = self.edge_of[source]
+            ks, kt = self.edge_pos[source], self.edge_pos[target]
+            extra[S].append((T, abs(ks - kt), (e, ks, kt)))
+
+        # Heurística de Manhattan hacia goal; las entradas del heap son
+        # enteros (f*span + h)*(n+2) + vértice, que a igual f prefieren el
+        # vértice más cercano a goal
+        ty, tx = divmod(target, cols)
+        node_y, node_x, links = self.node_y, self.node_x, self.links
+        h_source = abs(start[0] - ty) + abs(start[1] - tx)
+        width = n + 2
+        span = self.rows + cols
+
+        dist = array('i', [-1]) * width
+        closed = bytearray(width)
+        came: Dict[int, Tuple[int, Tuple[int, int, int]]] = {}
+        dist[S] = 0
+        heap = [(h_source * span + h_source) * width + S]
+        pop, push = heapq.heappop, heapq.heappush
+        nodes_explored = 0
+        while heap:
+            u = pop(heap) % width
+            if closed[u]:
+                continue
+            closed[u] = 1
+            nodes_explored += 1
+            if u == T:
+                hops = []
+                while u != S:
+                    u, hop = came[u]
+                    hops.append(hop)
+                hops.reverse()
+                return JunctionPath(self, hops, dist[T], nodes_explored, source)
+            d = dist[u]
+            for edges in (links[u] if u < n else (), extra.get(u, ())):
+                for v, w, hop in edges:
+                    nd = d + w
+                    if dist[v] < 0 or nd < dist[v]:
+                        dist[v] = nd
+                        came[v] = (u, hop)
+                        if v < n:
+                            hv = abs(node_y[v] - ty) + abs(node_x[v] - tx)
+                        elif v == n:
+                            hv = h_source
+                        else:
+                            hv = 0
+                        push(heap, ((nd + hv) * span + hv) * width + v)
+        return JunctionPath(self, None, -1, nodes_explored, source)
+
+
+class JunctionPath:
+    """Resultado de una consulta: longitud inmediata y celdas bajo demanda.
+
+    Si no hay camino, hops es None y length vale -1.
+    """
+
+    def __init__(self, graph: JunctionGraph, hops, length: int, nodes_explored: int, source: int):
+        self.graph, self.hops = graph, hops
+        self.length, self.nodes_explored = length, nodes_explored
+        self.source = source
+
+    def cells(self) -> List[Tuple[int, int]]:
+        """Expande los tramos del grafo al camino completo celda a celda"""
+        if self.hops is None:
+            return []
+        cols = self.graph.cols
+        path = [divmod(self.source, cols)]
+        for e, i, j in self.hops:
+            cells = self.graph.edge_cells(e)
+            step = 1 if j >= i else -1
+            path.extend(divmod(cells[k], cols) for k in range(i + step, j + step, step))
+        return path
+
+
+_graph_cache = FingerprintCache(JunctionGraph)
+
+
+def junction_graph(grid: Grid) -> JunctionGraph:
+    """Grafo de cruces del laberinto, cacheado por la huella de su contenido"""
+    return _graph_cache.get(as_grid(grid))
+
+
+def junction_search(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int]
+) -> Tuple[List[Tuple[int, int]], int]:
+    """Camino más corto buscando sobre el grafo de cruces.
+
+    nodes_explored cuenta vértices del grafo, no celdas. Si start o goal
+    están en un ciclo sin cruces se recurre a bfs.
+    """
+    grid = as_grid(grid)
+    graph = junction_graph(grid)
+    cols = grid.cols
+    if not graph._links(start[0] * cols + start[1]) or not graph._links(goal[0] * cols + goal[1]):
+        return bfs(grid, start, goal)
+    result = graph.query(start, goal)
+    return result.cells(), result.nodes_explored
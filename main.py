@@ -4,33 +4,47 @@ import random
 import sys
 from Kruskal import KruskalMaze
 from prim    import PrimMaze
+from eller   import EllerMaze
+from animation import BackgroundTask, FrameScheduler, wait_for_quit
+from maze_grid import MazeGrid, as_grid
+from visualization import blit_cells
 
 # ———— CONSTANTES ————
 SEED      = 123         
 CELL_SIZE = 16          # esta en px
-DELAY_MS  = 30          # retardo entre frames en milisegundos
+FPS       = 60          # frames por segundo de la animación
+STEP      = 1           # celdas abiertas por paso del generador
+MAX_ANIMATION_S = 20    # duración máxima de la animación en segundos (None = sin límite)
 # ———————————————————
 
 def get_dimensions():
     m = int(input("Número de filas : "))
     n = int(input("Número de columnas : "))
-    print("Seleccione el algoritmo: 1) Kruskal 2) Prim ")
+    print("Seleccione el algoritmo: 1) Kruskal 2) Prim 3) Eller ")
     algo = int(input("Algoritmo a usar: "))
     return m, n, algo
 
+COLORS = {
+    1: (  0,   0,   0),
+    0: (255, 255, 255),
+    2: (200, 200, 200),
+}
+
 def draw(area, screen):
-    cols = len(area[0])
-    rows = len(area)
-    for y in range(rows):
-        for x in range(cols):
-            v = area[y][x]
-            if v == 1:      color = (  0,   0,   0)   
-            elif v == 0:    color = (255, 255, 255)   
-            else:           color = (200, 200, 200)   
-            rect = pygame.Rect(x*CELL_SIZE, y*CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, color, rect)
+    """Repinta todo el laberinto con un único blit del búfer de celdas"""
+    area = as_grid(area)
+    blit_cells(screen, area.data, area.rows, area.cols, CELL_SIZE)
     pygame.display.flip()
 
+def draw_changes(changes, screen):
+    """Repinta solo las celdas modificadas y actualiza esos rectángulos"""
+    dirty = []
+    for y, x, v in changes:
+        rect = pygame.Rect(x*CELL_SIZE, y*CELL_SIZE, CELL_SIZE, CELL_SIZE)
+        pygame.draw.rect(screen, COLORS[v], rect)
+        dirty.append(rect)
+    pygame.display.update(dirty)
+
 def main():
     if SEED is not None:
         random.seed(SEED)
@@ -44,27 +58,39 @@ def main():
 
     
     if algo == 1:
-        generator = KruskalMaze(rows, cols).generate()
+        maze = KruskalMaze(rows, cols)
+    elif algo == 3:
+        maze = EllerMaze(rows, cols)
     else:
-        generator = PrimMaze(rows, cols).generate()
+        maze = PrimMaze(rows, cols)
+
+    # Todos los generadores parten de un laberinto lleno de paredes
+    draw(MazeGrid(rows, cols), screen)
 
+    # La generación corre en otro hilo y manda los cambios por una cola;
+    # la ventana sigue respondiendo aunque el laberinto sea grande
+    def produce(emit):
+        for changes in maze.generate(STEP):
+            emit(changes)
+    task = BackgroundTask(produce)
 
-    for area in generator:
-      
-        for evt in pygame.event.get():
-            if evt.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    # Los cambios se acumulan y se pintan una vez por frame
+    pending = []
+    def present():
+        draw_changes(pending, screen)
+        pending.clear()
 
-        draw(area, screen)
-        pygame.time.delay(DELAY_MS)
+    scheduler = FrameScheduler(FPS, MAX_ANIMATION_S)
+    # Sin per_frame, cada frame aplica todos los pasos que caben en su
+    # presupuesto de tiempo, así que la duración no crece con el laberinto
+    if not scheduler.follow(task, pending.extend, present):
+        pygame.quit()
+        sys.exit()
+    task.result()
 
-  
-    while True:
-        for evt in pygame.event.get():
-            if evt.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
+    # Ventana estática: esperar eventos sin consumir CPU
+    wait_for_quit()
+    pygame.quit()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,164 @@
+"""Formato binario de laberintos: cabecera más 1 bit por celda (1 = pared).
+
+Cabecera (little endian, 68 bytes):
+    magic "MAZE", versión, reservado, filas, columnas, crc32 del cuerpo,
+    generador (16 bytes, UTF-8) y semilla (32 bytes, texto UTF-8).
+El cuerpo son las celdas fila por fila empaquetadas con el bit más
+significativo primero (como numpy.packbits).
+"""
+import mmap
+import os
+import struct
+import zlib
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from maze_grid import Grid, MazeGrid, as_grid
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional; sin él se usa una tabla de búsqueda
+    np = None
+
+MAGIC = b"MAZE"
+VERSION = 1
+GENERATOR_BYTES, SEED_BYTES = 16, 32
+_HEADER = struct.Struct(f"<4sHHIII{GENERATOR_BYTES}s{SEED_BYTES}s")
+
+# Byte empaquetado -> sus 8 celdas
+_UNPACK = [bytes((b >> (7 - k)) & 1 for k in range(8)) for b in range(256)]
+
+
+class MazeHeader(NamedTuple):
+    rows: int
+    cols: int
+    generator: str
+    seed: Optional[str]
+
+
+def _text_fields(generator: str, seed) -> Tuple[bytes, bytes]:
+    """Generador y semilla codificados para la cabecera.
+
+    struct rellena o recorta los campos de texto sin avisar; una semilla
+    recortada ya no coincidiría con la pedida al volver a cargar el archivo,
+    así que los valores demasiado largos son un error.
+    """
+    gen = generator.encode("utf-8")
+    raw_seed = b"" if seed is None else str(seed).encode("utf-8")
+    if len(gen) > GENERATOR_BYTES:
+        raise ValueError(f"El nombre del generador no cabe en la cabecera ({len(gen)} > {GENERATOR_BYTES} bytes)")
+    if len(raw_seed) > SEED_BYTES:
+        raise ValueError(f"La semilla no cabe en la cabecera ({len(raw_seed)} > {SEED_BYTES} bytes)")
+    return gen, raw_seed
+
+
+def _pack(data) -> bytes:
+    if np is not None:
+        return np.packbits(np.frombuffer(data, dtype=np.uint8)).tobytes()
+    packed = bytearray((len(data) + 7) // 8)
+    for i, v in enumerate(data):
+        if v:
+            packed[i >> 3] |= 0x80 >> (i & 7)
+    return bytes(packed)
+
+
+def _unpack(body, size: int) -> bytearray:
+    if np is not None:
+        cells = bytearray(size)
+        np.frombuffer(cells, dtype=np.uint8)[:] = np.unpackbits(
+            np.frombuffer(body, dtype=np.uint8), count=size)
+        return cells
+    return bytearray(b"".join(_UNPACK[b] for b in body)[:size])
+
+
+def save_maze(path: str, area: Grid, generator: str = "", seed=None):
+    """Guarda el laberinto; solo admite celdas 0 (libre) y 1 (pared)"""
+    area = as_grid(area)
+    if area.count(0) + area.count(1) != area.rows * area.cols:
+        raise ValueError("Solo se pueden guardar laberintos terminados (celdas 0 y 1)")
+    gen, raw_seed = _text_fields(generator, seed)
+    body = _pack(area.buffer())
+    header = _HEADER.pack(MAGIC, VERSION, 0, area.rows, area.cols, zlib.crc32(body), gen, raw_seed)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(body)
+
+
+def save_rows(path: str, rows: int, cols: int, row_iter: Iterable, generator: str = "", seed=None):
+    """Guarda un laberinto que llega fila a fila (por ejemplo de EllerMaze.iter_rows).
+
+    Solo se guardan en memoria la fila actual y los bits que no completan
+    un byte; el crc32 se acumula sobre la marcha y la cabecera se reescribe
+    al final.
+    """
+    gen, seed = _text_fields(generator, seed)
+    crc, pending, count = 0, b"", 0
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, rows, cols, 0, gen, seed))
+        for row in row_iter:
+            if len(row) != cols:
+                raise ValueError(f"Se esperaban filas de {cols} celdas")
+            if row.count(0) + row.count(1) != cols:
+                raise ValueError("Solo se pueden guardar laberintos terminados (celdas 0 y 1)")
+            count += 1
+            cells = pending + bytes(row)
+            full = len(cells) - len(cells) % 8
+            chunk = _pack(cells[:full])
+            pending = cells[full:]
+            crc = zlib.crc32(chunk, crc)
+            f.write(chunk)
+        if count != rows:
+            raise ValueError(f"Se esperaban {rows} filas y se recibieron {count}")
+        if pending:
+            chunk = _pack(pending)
+            crc = zlib.crc32(chunk, crc)
+            f.write(chunk)
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, rows, cols, crc, gen, seed))
+
+
+def _parse_header(buf) -> Tuple[MazeHeader, int]:
+    if len(buf) < _HEADER.size:
+        raise ValueError("Archivo de laberinto truncado")
+    magic, version, _, rows, cols, crc, generator, seed = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise ValueError("No es un archivo de laberinto")
+    if version != VERSION:
+        raise ValueError(f"Versión de formato no soportada: {version}")
+    seed = seed.rstrip(b"\0").decode("utf-8")
+    header = MazeHeader(rows, cols, generator.rstrip(b"\0").decode("utf-8"), seed or None)
+    return header, crc
+
+
+def read_header(path: str) -> MazeHeader:
+    """Lee solo la cabecera del archivo"""
+    with open(path, "rb") as f:
+        return _parse_header(f.read(_HEADER.size))[0]
+
+
+def load_maze(path: str) -> Tuple[MazeGrid, MazeHeader]:
+    """Carga un laberinto mapeando el archivo en memoria.
+
+    El cuerpo se lee directamente del mapa (sin copiarlo a un búfer de
+    Python), se verifica su crc32 y se desempaqueta a un byte por celda,
+    que es lo que usa MazeGrid.
+    """
+    with open(path, "rb") as f:
+        # mmap no admite archivos vacíos; se comprueba antes con el mismo error
+        # que un archivo con la cabecera incompleta
+        if os.fstat(f.fileno()).st_size < _HEADER.size:
+            raise ValueError("Archivo de laberinto truncado")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header, crc = _parse_header(mm)
+            size = header.rows * header.cols
+            view = memoryview(mm)
+            try:
+                body = view[_HEADER.size:_HEADER.size + (size + 7) // 8]
+                if len(body) * 8 < size:
+                    raise ValueError("Archivo de laberinto truncado")
+                if zlib.crc32(body) != crc:
+                    raise ValueError("Checksum incorrecto: el archivo está dañado")
+                cells = _unpack(body, size)
+            finally:
+                body = None
+                view.release()
+    return MazeGrid(header.rows, header.cols, data=cells), header
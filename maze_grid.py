@@ -0,0 +1,141 @@
+import hashlib
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+
+class MazeGrid:
+    """Laberinto guardado en un búfer contiguo de bytes (uint8), fila por fila.
+
+    La celda (y, x) vive en data[y*cols + x]. Para compatibilidad con el
+    código que usa listas anidadas, grid[y] devuelve una vista de la fila
+    (memoryview) que admite lectura y escritura con grid[y][x].
+    """
+
+    def __init__(self, rows: int, cols: int, fill: int = 1, data=None):
+        self.rows, self.cols = rows, cols
+        if data is None:
+            data = bytearray([fill]) * (rows * cols)
+        elif len(data) != rows * cols:
+            raise ValueError(f"Se esperaban {rows * cols} celdas y se recibieron {len(data)}")
+        self.data = data
+        self._view = memoryview(data).cast('B')
+
+    @classmethod
+    def from_rows(cls, area: List[List[int]]) -> "MazeGrid":
+        """Copia una lista de listas en un MazeGrid"""
+        rows, cols = len(area), len(area[0])
+        data = bytearray(rows * cols)
+        for y, row in enumerate(area):
+            data[y*cols:(y+1)*cols] = bytes(row)
+        return cls(rows, cols, data=data)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, y: int) -> memoryview:
+        if y < 0:
+            y += self.rows
+        if not 0 <= y < self.rows:
+            raise IndexError("fila fuera de rango")
+        return self._view[y*self.cols:(y+1)*self.cols]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        for y in range(self.rows):
+            yield self[y]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, MazeGrid):
+            return (self.rows, self.cols) == (other.rows, other.cols) and self._view == other._view
+        if isinstance(other, list):
+            return self.tolist() == other
+        return NotImplemented
+
+    def index(self, y: int, x: int) -> int:
+        """Índice plano de la celda (y, x)"""
+        return y*self.cols + x
+
+    def coords(self, i: int) -> Tuple[int, int]:
+        """Coordenadas (y, x) del índice plano i"""
+        return divmod(i, self.cols)
+
+    def get(self, y: int, x: int) -> int:
+        return self.data[y*self.cols + x]
+
+    def set(self, y: int, x: int, value: int):
+        self.data[y*self.cols + x] = value
+
+    def row(self, y: int) -> memoryview:
+        """Vista (sin copia) de la fila y"""
+        return self[y]
+
+    def col(self, x: int) -> bytes:
+        """Copia de la columna x"""
+        return bytes(self._view[x::self.cols])
+
+    def fingerprint(self) -> bytes:
+        """Huella del contenido; cambia con cualquier modificación de las celdas"""
+        h = hashlib.blake2b(self._view, digest_size=16)
+        h.update(b"%d:%d" % (self.rows, self.cols))
+        return h.digest()
+
+    def buffer(self) -> memoryview:
+        """Vista plana (sin copia) de todas las celdas"""
+        return self._view
+
+    def to_numpy(self):
+        """Vista NumPy (rows, cols) de tipo uint8 que comparte memoria con el grid"""
+        if np is None:
+            raise ImportError("NumPy no está disponible")
+        return np.frombuffer(self.data, dtype=np.uint8).reshape(self.rows, self.cols)
+
+    def copy(self) -> "MazeGrid":
+        return MazeGrid(self.rows, self.cols, data=bytearray(self.data))
+
+    def tolist(self) -> List[List[int]]:
+        return [list(self[y]) for y in range(self.rows)]
+
+    def count(self, value: int) -> int:
+        """Número de celdas con el valor dado"""
+        data = self.data if isinstance(self.data, bytearray) else self._view.tobytes()
+        return data.count(value)
+
+
+Grid = Union[MazeGrid, List[List[int]]]
+
+
+class FingerprintCache:
+    """Caché LRU de estructuras derivadas de un laberinto, indexada por su huella.
+
+    Como la clave es el contenido, cualquier modificación del grid hace que
+    la estructura se reconstruya en la siguiente consulta.
+    """
+
+    def __init__(self, build: Callable[[MazeGrid], object], maxsize: int = 8):
+        self.build, self.maxsize = build, maxsize
+        self.entries: "OrderedDict[bytes, object]" = OrderedDict()
+
+    def get(self, grid: MazeGrid):
+        key = grid.fingerprint()
+        value = self.entries.get(key)
+        if value is None:
+            value = self.entries[key] = self.build(grid)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+        else:
+            self.entries.move_to_end(key)
+        return value
+
+
+def as_grid(area: Grid) -> MazeGrid:
+    """Devuelve area como MazeGrid; las listas anidadas y arreglos NumPy se copian"""
+    if isinstance(area, MazeGrid):
+        return area
+    if np is not None and isinstance(area, np.ndarray):
+        rows, cols = area.shape
+        return MazeGrid(rows, cols, data=bytearray(area.astype(np.uint8).tobytes()))
+    return MazeGrid.from_rows(area)
@@ -0,0 +1,155 @@
+import struct
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from maze_grid import Grid, as_grid
+from search import ALGORITHMS, ExplorationTrace
+
+# Movimientos codificados en 2 bits: arriba, abajo, izquierda, derecha
+MOVES = ((-1, 0), (1, 0), (0, -1), (0, 1))
+_MOVE_CODE = {move: code for code, move in enumerate(MOVES)}
+_HEADER = struct.Struct("<III")  # y, x de la primera celda y número de movimientos
+
+
+def encode_path(path: List[Tuple[int, int]]) -> bytes:
+    """Codifica un camino como celda inicial más 2 bits por movimiento.
+
+    El camino vacío (sin solución) se codifica como b"".
+    """
+    if not path:
+        return b""
+    moves = len(path) - 1
+    packed = bytearray((moves + 3) // 4)
+    for i in range(moves):
+        (y0, x0), (y1, x1) = path[i], path[i + 1]
+        code = _MOVE_CODE.get((y1 - y0, x1 - x0))
+        if code is None:
+            raise ValueError(f"Paso no contiguo entre {path[i]} y {path[i + 1]}")
+        packed[i >> 2] |= code << ((i & 3) * 2)
+    return _HEADER.pack(path[0][0], path[0][1], moves) + bytes(packed)
+
+
+def decode_path(blob: bytes) -> List[Tuple[int, int]]:
+    """Inverso de encode_path"""
+    if not blob:
+        return []
+    y, x, moves = _HEADER.unpack_from(blob)
+    packed = memoryview(blob)[_HEADER.size:]
+    path = [(y, x)]
+    for i in range(moves):
+        dy, dx = MOVES[(packed[i >> 2] >> ((i & 3) * 2)) & 3]
+        y, x = y + dy, x + dx
+        path.append((y, x))
+    return path
+
+
+class PathCache:
+    """Caché LRU de resultados de búsqueda.
+
+    La clave es (huella del grid, algoritmo, start, goal): como la huella
+    depende del contenido, cualquier cambio en las celdas (por ejemplo lo que
+    abre ensure_connectivity) produce claves nuevas y nunca se sirven
+    resultados viejos. Se desaloja la entrada menos usada cuando se supera
+    max_entries o max_bytes.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 4 << 20):
+        self.max_entries, self.max_bytes = max_entries, max_bytes
+        self.entries: "OrderedDict[tuple, Tuple[bytes, int, bytes]]" = OrderedDict()
+        self.nbytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    @staticmethod
+    def key(grid: Grid, algorithm: str, start: Tuple[int, int], goal: Tuple[int, int]) -> tuple:
+        return (as_grid(grid).fingerprint(), algorithm, tuple(start), tuple(goal))
+
+    def get(
+        self,
+        key: tuple,
+        explored: bool = False
+    ) -> Optional[Tuple[List[Tuple[int, int]], int, Optional[List[Tuple[int, int]]]]]:
+        """(camino, nodos explorados, orden de exploración o None), o None si no está.
+
+        Con explored=True solo sirven las entradas que guardaron el orden de
+        exploración; las demás cuentan como fallo.
+        """
+        entry = self.entries.get(key)
+        if entry is None or (explored and not entry[2]):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        blob, nodes_explored, explored_blob = entry
+        if not explored:
+            return decode_path(blob), nodes_explored, None
+        (cols,) = struct.unpack_from("<I", explored_blob)
+        cells = array('i')
+        cells.frombytes(explored_blob[4:])
+        return decode_path(blob), nodes_explored, [divmod(i, cols) for i in cells]
+
+    def put(
+        self,
+        key: tuple,
+        path: List[Tuple[int, int]],
+        nodes_explored: int,
+        explored: Optional[List[Tuple[int, int]]] = None,
+        cols: int = 0
+    ):
+        """Guarda un resultado; explored (opcional) se guarda como índices planos"""
+        blob = encode_path(path)
+        explored_blob = b""
+        if explored:
+            explored_blob = struct.pack("<I", cols) + array('i', [y * cols + x for y, x in explored]).tobytes()
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.nbytes -= _size(old)
+        entry = (blob, nodes_explored, explored_blob)
+        size = _size(entry)
+        if size > self.max_bytes:
+            return
+        self.entries[key] = entry
+        self.nbytes += size
+        while len(self.entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, evicted = self.entries.popitem(last=False)
+            self.nbytes -= _size(evicted)
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self.entries), "bytes": self.nbytes,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+        }
+
+    def clear(self):
+        self.entries.clear()
+        self.nbytes = 0
+
+
+def _size(entry: Tuple[bytes, int, bytes]) -> int:
+    return len(entry[0]) + len(entry[2])
+
+
+def cached_search(
+    cache: PathCache,
+    grid: Grid,
+    algorithm: str,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    trace: bool = False
+) -> Tuple[List[Tuple[int, int]], int, Optional[List[Tuple[int, int]]]]:
+    """Ejecuta ALGORITHMS[algorithm] pasando antes por la caché.
+
+    Devuelve (camino, nodos explorados, orden de exploración); el orden solo
+    se calcula y se guarda con trace=True (si no, es None).
+    """
+    grid = as_grid(grid)
+    key = cache.key(grid, algorithm, start, goal)
+    hit = cache.get(key, explored=trace)
+    if hit is not None:
+        return hit
+    observer = ExplorationTrace(parents=False) if trace else None
+    path, nodes_explored = ALGORITHMS[algorithm][1](grid, start, goal, observer)
+    explored = observer.explored if trace else None
+    cache.put(key, path, nodes_explored, explored, grid.cols)
+    return path, nodes_explored, explored
@@ -1,39 +1,115 @@
 import random
+from array import array
+from maze_grid import MazeGrid
+
+
+class IndexedFrontier:
+    """Frontera con pertenencia y extracción aleatoria en O(1).
+
+    Guarda las celdas (índice plano y*cols + x) en una lista y la posición
+    de cada una en un arreglo paralelo; al extraer se intercambia con la
+    última. Cada celda aparece a lo sumo una vez, así que el tamaño queda
+    acotado por el número de celdas del laberinto.
+    """
+
+    def __init__(self, size: int):
+        self.items = []
+        self.pos = array('i', [-1]) * size
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, cell: int) -> bool:
+        return self.pos[cell] >= 0
+
+    def add(self, cell: int):
+        if self.pos[cell] < 0:
+            self.pos[cell] = len(self.items)
+            self.items.append(cell)
+
+    def pop_random(self) -> int:
+        items, pos = self.items, self.pos
+        idx = random.randrange(len(items))
+        cell, last = items[idx], items.pop()
+        if last != cell:
+            items[idx] = last
+            pos[last] = idx
+        pos[cell] = -1
+        return cell
+
 
 class PrimMaze:
     def __init__(self, rows, cols):
         self.rows, self.cols = rows, cols
-        self.area = [[1]*cols for _ in range(rows)]
-        self.frontiers = []
+        self.area = MazeGrid(rows, cols)
+        self.frontiers = IndexedFrontier(rows*cols)
+        # Cambios (y, x, valor) pendientes de entregar; None si no se animan
+        self.changes = None
 
     def mark(self, y, x):
-        self.area[y][x] = 0
-        yield self.area
-        for dy, dx in [(-2,0),(2,0),(0,-2),(0,2)]:
+        """Añade (y, x) al laberinto y sus vecinos libres a la frontera"""
+        cols, data = self.cols, self.area.data
+        data[y*cols + x] = 0
+        changes = self.changes
+        if changes is not None:
+            changes.append((y, x, 0))
+        for ny, nx in ((y-2, x), (y+2, x), (y, x-2), (y, x+2)):
+            if 0 < ny < self.rows-1 and 0 < nx < cols-1:
+                cell = ny*cols + nx
+                # El 2 solo se usa para pintar la frontera; la pertenencia la lleva el índice
+                if cell not in self.frontiers and data[cell] != 0:
+                    data[cell] = 2
+                    self.frontiers.add(cell)
+                    if changes is not None:
+                        changes.append((ny, nx, 2))
+
+    def carve_next(self):
+        """Saca una celda de la frontera al azar y la conecta; False si no pudo"""
+        cols, data = self.cols, self.area.data
+        y, x = divmod(self.frontiers.pop_random(), cols)
+        vecinos = []
+        for dy, dx in ((-2,0),(2,0),(0,-2),(0,2)):
             ny, nx = y+dy, x+dx
-            if 0 < ny < self.rows-1 and 0 < nx < self.cols-1 and self.area[ny][nx] == 1:
-                self.area[ny][nx] = 2
-                self.frontiers.append((ny, nx))
-                yield self.area
+            if 0 <= ny < self.rows and 0 <= nx < cols and data[ny*cols + nx] == 0:
+                vecinos.append((dy, dx))
+        if not vecinos:
+            return False
 
-    def generate(self):
+        dy, dx = random.choice(vecinos)
+        data[(y + dy//2)*cols + x + dx//2] = 0
+        if self.changes is not None:
+            self.changes.append((y + dy//2, x + dx//2, 0))
+        self.mark(y, x)
+        return True
+
+    def start(self):
         sy = random.randrange(1, self.rows-1, 2)
         sx = random.randrange(1, self.cols-1, 2)
-        yield from self.mark(sy, sx)
+        self.mark(sy, sx)
+
+    def build(self):
+        """Genera el laberinto completo sin pasos intermedios y lo devuelve"""
+        self.start()
+        frontiers, carve_next = self.frontiers, self.carve_next
+        while frontiers:
+            carve_next()
+        return self.area
+
+    def generate(self, step=1):
+        """Genera el laberinto entregando cada `step` celdas conectadas la
+        lista de celdas modificadas como tuplas (y, x, valor)"""
+        self.changes = []
+        self.start()
+        yield self.changes
 
+        self.changes = []
+        carved = 0
         while self.frontiers:
-            idx = random.randrange(len(self.frontiers))
-            y, x = self.frontiers.pop(idx)
-            vecinos = []
-            for dy, dx in [(-2,0),(2,0),(0,-2),(0,2)]:
-                ny, nx = y+dy, x+dx
-                if 0 <= ny < self.rows and 0 <= nx < self.cols and self.area[ny][nx] == 0:
-                    vecinos.append((dy, dx))
-            if not vecinos:
-                continue
-
-            dy, dx = random.choice(vecinos)
-            self.area[y + dy//2][x + dx//2] = 0
-            self.area[y][x] = 0
-            yield self.area
-            yield from self.mark(y, x)
+            if self.carve_next():
+                carved += 1
+                if carved % step == 0:
+                    yield self.changes
+                    self.changes = []
+        if self.changes:
+            yield self.changes
+        self.changes = None
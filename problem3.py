@@ -2,99 +2,153 @@
 import os
 import sys
 sys.path.insert(0, os.path.dirname(__file__))
+import argparse
 import random
 import time
-import pygame
 import statistics
-from typing import List, Tuple, Dict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Tuple, Dict, Optional
 
 from Kruskal import KruskalMaze
-from search import bfs, dfs, uniform_cost_search, astar, manhattan
-from visualization import (
-    initialize_pygame,
-    visualize_exploration,
-    show_stats
-)
+from maze_file import load_maze, save_maze
+from maze_grid import MazeGrid
+from search import ALGORITHMS, ExplorationTrace
+from tree_index import tree_index
+from visualization import SnapshotRenderer
 
 
 # Número de escenarios
 K = 25
 ROWS, COLS = 45, 55
+SEED = 123
 
 # Carpeta de salida para capturas
 OUT_DIR = "problem3_vis"
-os.makedirs(OUT_DIR, exist_ok=True)
 
-def random_positions(area: List[List[int]]) -> Tuple[Tuple[int,int], Tuple[int,int]]:
+def random_positions(area: MazeGrid) -> Tuple[Tuple[int,int], Tuple[int,int]]:
     """Selecciona start y goal al azar en celdas libres (0) que estén a Manhattan >= 10."""
-    libres = [(y,x) for y,row in enumerate(area) for x,v in enumerate(row) if v == 0]
+    libres = [area.coords(i) for i, v in enumerate(area.data) if v == 0]
     while True:
         a = random.choice(libres)
         b = random.choice(libres)
         if abs(a[0] - b[0]) + abs(a[1] - b[1]) >= 10:
             return a, b
 
-def run_comparison():
+def scenario_seed(master_seed: int, i: int) -> str:
+    """Semilla del escenario i; solo depende de la semilla maestra y de i"""
+    return f"{master_seed}:{i}"
+
+def scenario_maze(i: int, seed: str, corpus: Optional[str] = None) -> MazeGrid:
+    """Laberinto del escenario i; con corpus se carga de (o se guarda en) corpus/esc{i}.maze"""
+    random.seed(seed)
+    filename = None if corpus is None else os.path.join(corpus, f"esc{i}.maze")
+    if filename is not None and os.path.exists(filename):
+        area, header = load_maze(filename)
+        if header.seed == seed and (header.rows, header.cols) == (ROWS, COLS):
+            return area
+    area = KruskalMaze(ROWS, COLS).build()
+    if filename is not None:
+        save_maze(filename, area, "kruskal", seed)
+    return area
+
+def run_scenario(i: int, seed: str, keep_trace: bool = False, corpus: Optional[str] = None) -> Dict:
+    """Genera y resuelve el escenario i (se ejecuta en un proceso del pool).
+
+    Con keep_trace se devuelven también el laberinto, la exploración y los
+    caminos para la etapa de renderizado.
+    """
+    area = scenario_maze(i, seed, corpus)
+    # Semilla propia para los extremos: no depende de si el laberinto se cargó o se generó
+    random.seed(f"{seed}:posiciones")
+    start, goal = random_positions(area)
+    # El laberinto de Kruskal es un árbol: longitud óptima sin búsqueda
+    optimo = tree_index(area).distance(start, goal) + 1
+
+    results: List[Dict] = []
+    traces = []
+    for name, fn in ALGORITHMS.values():
+        trace = ExplorationTrace(parents=False) if keep_trace else None
+        t0 = time.perf_counter()
+        path, nodes = fn(area, start, goal, trace)
+        t1 = time.perf_counter()
+        results.append({
+            'escenario': i,
+            'algoritmo': name,
+            'nodos': nodes,
+            'tiempo': t1 - t0,
+            'longitud': len(path),
+            'optimo': optimo
+        })
+        if keep_trace:
+            traces.append((name, trace.explored, path, nodes))
+
+    scenario = {'escenario': i, 'resultados': results}
+    if keep_trace:
+        scenario.update(area=bytes(area.data), start=start, goal=goal, trazas=traces)
+    return scenario
+
+def render_scenario(renderer: SnapshotRenderer, scenario: Dict):
+    """Encola una captura por algoritmo del escenario (sin ventana ni pausas)"""
+    i = scenario['escenario']
+    area = MazeGrid(ROWS, COLS, data=bytearray(scenario['area']))
+    start, goal = scenario['start'], scenario['goal']
+    for name, explored, path, nodes in scenario['trazas']:
+        renderer.render(area, start, goal, explored, path, name, nodes)
+        filename = os.path.join(
+            OUT_DIR, f"esc{i}_{name.replace('*','star').replace(' ', '_')}.png"
+        )
+        renderer.snapshot(filename)
+
+def run_comparison(
+    k: int = K,
+    workers: Optional[int] = None,
+    master_seed: int = SEED,
+    render: bool = True,
+    corpus: Optional[str] = None
+):
+    """Ejecuta k escenarios repartidos en un pool de procesos.
+
+    Cada escenario usa una semilla derivada de master_seed, así que los
+    resultados no dependen del número de procesos. Con workers=1 todo se
+    ejecuta en el proceso actual. Con corpus, los laberintos se leen de
+    (o se guardan en) esa carpeta en lugar de regenerarse.
+    """
     results: List[Dict] = []
-    algos = [
-        ('BFS', bfs),
-        ('DFS', dfs),
-        ('UCS', uniform_cost_search),
-        ('A*', lambda g,s,t: astar(g,s,t,manhattan))
-    ]
-
-    for i in range(1, K+1):
-        # 1) Generar laberinto
-        maze = KruskalMaze(ROWS, COLS)
-        for area in maze.generate(): pass  # agotamos el generator
-        start, goal = random_positions(area)
-
-        # 2) Para cada algoritmo:
-        for name, fn in algos:
-            # — Ejecutar algoritmo y medir
-            t0 = time.perf_counter()
-            path, nodes = fn(area, start, goal)
-            t1 = time.perf_counter()
-            results.append({
-                'escenario': i,
-                'algoritmo': name,
-                'nodos': nodes,
-                'tiempo': t1 - t0,
-                'longitud': len(path)
-            })
-
-            # — Visualizar escenario
-            screen = initialize_pygame(ROWS, COLS)
-            from solve_maze import track_exploration
-
-            # Determinar la clave correcta para track_exploration
-            if name == 'A*':
-                key = 'astar'
-            else:
-                key = name.lower()
-            
-            parent, explored, _ = track_exploration(
-                key, area, start, goal
-            )
-            # Reconstruimos path con tus funciones
-            from solve_maze import reconstruct_path
-            real_path = reconstruct_path(parent, start, goal)
-
-            visualize_exploration(screen, area, start, goal, explored, real_path)
-            show_stats(screen, len(real_path), nodes, name)
-
-            # — Guardar captura y cerrar ventana
-            filename = os.path.join(
-                OUT_DIR, f"esc{i}_{name.replace('*','star')}.png"
-            )
-            pygame.image.save(screen, filename)
-            pygame.quit()
-
-        print(f"Escenario {i} completado.")
-
-    # 3) Resumen promedio
+    algos = [name for name, _ in ALGORITHMS.values()]
+    seeds = [(i, scenario_seed(master_seed, i)) for i in range(1, k+1)]
+    if corpus is not None:
+        os.makedirs(corpus, exist_ok=True)
+    renderer = None
+    if render:
+        os.makedirs(OUT_DIR, exist_ok=True)
+        renderer = SnapshotRenderer(ROWS, COLS)
+
+    def collect(scenario: Dict):
+        # Los escenarios llegan en orden de finalización
+        results.extend(scenario['resultados'])
+        for r in scenario['resultados']:
+            if r['longitud'] != r['optimo']:
+                print(f"Aviso: {r['algoritmo']} encontró un camino de {r['longitud']} celdas "
+                      f"(óptimo {r['optimo']})")
+        print(f"Escenario {scenario['escenario']} completado.")
+        if renderer is not None:
+            render_scenario(renderer, scenario)
+
+    if workers == 1:
+        for i, seed in seeds:
+            collect(run_scenario(i, seed, render, corpus))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(run_scenario, i, seed, render, corpus) for i, seed in seeds]
+            for future in as_completed(futures):
+                collect(future.result())
+    if renderer is not None:
+        renderer.flush()
+    results.sort(key=lambda r: r['escenario'])
+
+    # Resumen promedio
     print("\n=== Resumen promedio de métricas ===")
-    for name, _ in algos:
+    for name in algos:
         subset = [r for r in results if r['algoritmo'] == name]
         mn = statistics.mean(r['nodos'] for r in subset)
         mt = statistics.mean(r['tiempo'] for r in subset)
@@ -103,11 +157,19 @@ def run_comparison():
 
     ranking = sorted(
         [(name, statistics.mean(r['tiempo'] for r in results if r['algoritmo']==name))
-         for name, _ in algos],
+         for name in algos],
         key=lambda x: x[1]
     )
     print("\nRanking por tiempo (mejor -> peor):", [r[0] for r in ranking])
+    return results
 
 if __name__ == '__main__':
-    random.seed(123)
-    run_comparison()
+    parser = argparse.ArgumentParser(description="Comparación de algoritmos de búsqueda")
+    parser.add_argument("-k", type=int, default=K, help="número de escenarios")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="procesos del pool (por defecto, todos los núcleos; 1 = secuencial)")
+    parser.add_argument("--seed", type=int, default=SEED, help="semilla maestra")
+    parser.add_argument("--no-render", action="store_true", help="no guardar capturas")
+    parser.add_argument("--corpus", help="carpeta de laberintos pregenerados (.maze)")
+    args = parser.parse_args()
+    run_comparison(args.k, args.workers, args.seed, not args.no_render, args.corpus)
@@ -1,131 +1,908 @@
-from collections import deque
-from typing import List, Tuple, Dict, Callable
+from array import array
+from typing import List, Tuple, Dict, Callable, Optional
 import heapq
+from indexed_heap import IndexedHeap
+from maze_grid import FingerprintCache, Grid, MazeGrid, as_grid
 
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional; wavefront_bfs recurre a bfs
+    np = None
 
-def bfs(
-    grid: List[List[int]],
-    start: Tuple[int, int],
-    goal: Tuple[int, int]
-) -> Tuple[List[Tuple[int, int]], int]:
-    rows, cols = len(grid), len(grid[0])
-    visited = [[False] * cols for _ in range(rows)]
-    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
-    queue = deque([start])
-    visited[start[0]][start[1]] = True
+
+class SearchObserver:
+    """Observador opcional de una búsqueda.
+
+    on_expand se llama al sacar una celda de la frontera y on_push al
+    añadir (o mejorar) una celda con su padre. Sin observador las
+    búsquedas no hacen ningún trabajo extra.
+    """
+
+    def on_expand(self, cell: Tuple[int, int]):
+        pass
+
+    def on_push(self, cell: Tuple[int, int], parent: Tuple[int, int]):
+        pass
+
+
+class ExplorationTrace(SearchObserver):
+    """Registra las celdas exploradas en orden y el padre de cada celda alcanzada.
+
+    Con parents=False solo se guarda el orden de exploración.
+    """
+
+    def __init__(self, parents: bool = True):
+        self.explored: List[Tuple[int, int]] = []
+        self.parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
+        self.parents = parents
+
+    def on_expand(self, cell: Tuple[int, int]):
+        self.explored.append(cell)
+
+    def on_push(self, cell: Tuple[int, int], parent: Tuple[int, int]):
+        if self.parents:
+            self.parent[cell] = parent
+
+
+class Adjacency:
+    """Lista de adyacencia en formato CSR sobre índices planos (y*cols + x).
+
+    Los vecinos libres de la celda i son targets[offsets[i]:offsets[i+1]],
+    en el orden arriba, abajo, izquierda, derecha. Se construye una vez por
+    laberinto y se reutiliza entre consultas (ver adjacency()). Los núcleos
+    recorren esos vecinos con range(offsets[u], offsets[u + 1]) para no
+    crear una rebanada por celda expandida.
+    """
+
+    def __init__(self, grid: MazeGrid):
+        rows, cols = grid.rows, grid.cols
+        self.rows, self.cols, self.size = rows, cols, rows * cols
+        if np is not None:
+            self._build_numpy(grid)
+        else:
+            self._build(grid)
+
+    def _build(self, grid: MazeGrid):
+        rows, cols, data = self.rows, self.cols, grid.data
+        offsets = array('i', bytes(4 * (self.size + 1)))
+        targets = array('i')
+        for i in range(self.size):
+            y, x = divmod(i, cols)
+            if y > 0 and data[i - cols] == 0:
+                targets.append(i - cols)
+            if y < rows - 1 and data[i + cols] == 0:
+                targets.append(i + cols)
+            if x > 0 and data[i - 1] == 0:
+                targets.append(i - 1)
+            if x < cols - 1 and data[i + 1] == 0:
+                targets.append(i + 1)
+            offsets[i + 1] = len(targets)
+        self.offsets, self.targets = offsets, targets
+
+    def _build_numpy(self, grid: MazeGrid):
+        rows, cols = self.rows, self.cols
+        free = grid.to_numpy() == 0
+        idx = np.arange(self.size, dtype=np.int32).reshape(rows, cols)
+        has = np.zeros((rows, cols, 4), dtype=bool)
+        has[1:, :, 0] = free[:-1, :]
+        has[:-1, :, 1] = free[1:, :]
+        has[:, 1:, 2] = free[:, :-1]
+        has[:, :-1, 3] = free[:, 1:]
+        nbr = np.stack((idx - cols, idx + cols, idx - 1, idx + 1), axis=-1)
+        offsets = np.zeros(self.size + 1, dtype=np.int32)
+        np.cumsum(has.reshape(self.size, 4).sum(axis=1), out=offsets[1:])
+        self.offsets = array('i', offsets.tobytes())
+        self.targets = array('i', nbr[has].astype(np.int32).tobytes())
+
+
+_adjacency_cache = FingerprintCache(Adjacency)
+
+
+def adjacency(grid: MazeGrid) -> Adjacency:
+    """Adyacencia CSR del laberinto, cacheada por la huella de su contenido"""
+    return _adjacency_cache.get(grid)
+
+
+def _bfs_flat(adj: Adjacency, source: int, target: int, on_expand=None, on_push=None):
+    offsets, targets = adj.offsets, adj.targets
+    parent = array('i', [-1]) * adj.size
+    parent[source] = source
+    # La cola es una lista que se recorre mientras crece; su posición es
+    # el número de nodos explorados
+    queue = [source]
+    push = queue.append
+    for nodes_explored, u in enumerate(queue, 1):
+        if on_expand:
+            on_expand(u)
+        if u == target:
+            return parent, nodes_explored
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if parent[v] < 0:
+                parent[v] = u
+                push(v)
+                if on_push:
+                    on_push(v, u)
+    return None, len(queue)
+
+
+def _dfs_flat(adj: Adjacency, source: int, target: int, on_expand=None, on_push=None):
+    offsets, targets = adj.offsets, adj.targets
+    parent = array('i', [-1]) * adj.size
+    parent[source] = source
+    stack = [source]
+    pop, push = stack.pop, stack.append
     nodes_explored = 0
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    while stack:
+        u = pop()
+        nodes_explored += 1
+        if on_expand:
+            on_expand(u)
+        if u == target:
+            return parent, nodes_explored
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if parent[v] < 0:
+                parent[v] = u
+                push(v)
+                if on_push:
+                    on_push(v, u)
+    return None, nodes_explored
+
+
+def _ucs_flat(adj: Adjacency, source: int, target: int, on_expand=None, on_push=None, costs=None):
+    """UCS con heap; costs (opcional) da el coste de entrar en cada celda.
 
-    while queue:
-        current = queue.popleft()
+    Las entradas del heap son enteros g*size + celda, de modo que el
+    desempate por celda coincide con el de las tuplas (g, (y, x)). Se usa
+    para costes demasiado grandes para la cola de cubetas de _dial_flat.
+    """
+    offsets, targets, size = adj.offsets, adj.targets, adj.size
+    parent = array('i', [-1]) * size
+    g_score = array('i', [-1]) * size
+    closed = bytearray(size)
+    g_score[source] = 0
+    heap = [source]
+    pop, push = heapq.heappop, heapq.heappush
+    nodes_explored = 0
+    while heap:
+        u = pop(heap) % size
+        if closed[u]:
+            continue
+        closed[u] = 1
         nodes_explored += 1
-        if current == goal:
-            return reconstruct_path(parent, start, goal), nodes_explored
-        for dy, dx in directions:
-            ny, nx = current[0] + dy, current[1] + dx
-            if 0 <= ny < rows and 0 <= nx < cols and not visited[ny][nx] and grid[ny][nx] == 0:
-                visited[ny][nx] = True
-                parent[(ny, nx)] = current
-                queue.append((ny, nx))
-    return [], nodes_explored
+        if on_expand:
+            on_expand(u)
+        if u == target:
+            return parent, nodes_explored
+        g_u = g_score[u]
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            new_g = g_u + (costs[v] or 1 if costs is not None else 1)
+            g = g_score[v]
+            if g < 0 or new_g < g:
+                g_score[v] = new_g
+                parent[v] = u
+                push(heap, new_g * size + v)
+                if on_push:
+                    on_push(v, u)
+    return None, nodes_explored
 
 
-def dfs(
-    grid: List[List[int]],
-    start: Tuple[int, int],
-    goal: Tuple[int, int]
-) -> Tuple[List[Tuple[int, int]], int]:
-    rows, cols = len(grid), len(grid[0])
-    visited = [[False] * cols for _ in range(rows)]
-    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
-    stack = [start]
-    visited[start[0]][start[1]] = True
+def _astar_flat(adj: Adjacency, source: int, target: int, on_expand=None, on_push=None, h=None,
+                costs=None):
+    """A* con entradas empaquetadas en un entero; sin h usa Manhattan hacia target.
+
+    Con Manhattan la entrada es (f*span + h)*size + celda: a igual f se
+    expande antes la celda más cercana a la meta, lo que evita recorrer
+    las mesetas de f de las zonas abiertas. Con una h propia (que recibe
+    el índice plano de la celda y puede devolver decimales, como la
+    euclídea) la entrada es la tupla (f, celda). costs es como en
+    _ucs_flat. Las entradas obsoletas se descartan al sacarlas: con el
+    heapq de C sale más barato que un heap indexado escrito en Python.
+    """
+    offsets, targets, size, cols = adj.offsets, adj.targets, adj.size, adj.cols
+    gy, gx = divmod(target, cols)
+    span = adj.rows + cols  # mayor que cualquier distancia Manhattan
+    packed = h is None
+    parent = array('i', [-1]) * size
+    g_score = array('i', [-1]) * size
+    closed = bytearray(size)
+    g_score[source] = 0
+    if packed:
+        hs = abs(source // cols - gy) + abs(source % cols - gx)
+        heap = [(hs * span + hs) * size + source]
+    else:
+        heap = [(h(source), source)]
+    pop, push = heapq.heappop, heapq.heappush
+    nodes_explored = 0
+    while heap:
+        u = pop(heap) % size if packed else pop(heap)[1]
+        if closed[u]:
+            continue
+        closed[u] = 1
+        nodes_explored += 1
+        if on_expand:
+            on_expand(u)
+        if u == target:
+            return parent, nodes_explored
+        g_u = g_score[u]
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            new_g = g_u + (costs[v] or 1 if costs is not None else 1)
+            g = g_score[v]
+            if g < 0 or new_g < g:
+                g_score[v] = new_g
+                parent[v] = u
+                if packed:
+                    hv = abs(v // cols - gy) + abs(v % cols - gx)
+                    push(heap, ((new_g + hv) * span + hv) * size + v)
+                else:
+                    push(heap, (new_g + h(v), v))
+                if on_push:
+                    on_push(v, u)
+    return None, nodes_explored
+
+
+def _astar_indexed(adj: Adjacency, source: int, target: int, on_expand=None, on_push=None, h=None,
+                   costs=None):
+    """_astar_flat sobre IndexedHeap (opción indexed=True de astar y UCS).
+
+    Cada celda ocupa como mucho una entrada y push rebaja su prioridad, así
+    que el heap no crece más que la frontera abierta; a cambio el sift se
+    hace en Python y es más lento que heapq. Mismas prioridades y mismo
+    orden de expansión que _astar_flat.
+    """
+    offsets, targets, size, cols = adj.offsets, adj.targets, adj.size, adj.cols
+    gy, gx = divmod(target, cols)
+    span = adj.rows + cols  # mayor que cualquier distancia Manhattan
+    packed = h is None
+    parent = array('i', [-1]) * size
+    g_score = array('i', [-1]) * size
+    g_score[source] = 0
+    frontier = IndexedHeap(size)
+    push, pop, pending = frontier.push, frontier.pop, frontier.items
+    if packed:
+        hs = abs(source // cols - gy) + abs(source % cols - gx)
+        push(source, (hs * span + hs) * size + source)
+    else:
+        push(source, (h(source), source))
     nodes_explored = 0
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    while pending:
+        u = pop()
+        nodes_explored += 1
+        if on_expand:
+            on_expand(u)
+        if u == target:
+            return parent, nodes_explored
+        g_u = g_score[u]
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            new_g = g_u + (costs[v] or 1 if costs is not None else 1)
+            g = g_score[v]
+            if g >= 0 and new_g >= g:
+                continue
+            if packed:
+                hv = abs(v // cols - gy) + abs(v % cols - gx)
+                key = ((new_g + hv) * span + hv) * size + v
+            else:
+                key = (new_g + h(v), v)
+            if push(v, key):
+                g_score[v] = new_g
+                parent[v] = u
+                if on_push:
+                    on_push(v, u)
+    return None, nodes_explored
 
-    while stack:
-        current = stack.pop()
+
+def _splice_backward(parent_f, parent_b, meet: int, target: int):
+    """Encadena en parent_f el tramo meet -> target de la búsqueda inversa"""
+    cur = meet
+    while cur != target:
+        nxt = parent_b[cur]
+        parent_f[nxt] = cur
+        cur = nxt
+    return parent_f
+
+
+def _bidirectional_bfs_flat(adj: Adjacency, source: int, target: int, on_expand=None, on_push=None):
+    """BFS desde ambos extremos, expandiendo por capas el frente más pequeño.
+
+    Al completar capas alternas, la primera celda alcanzada por los dos
+    lados ya da un camino mínimo.
+    """
+    offsets, targets = adj.offsets, adj.targets
+    parent_f = array('i', [-1]) * adj.size
+    parent_b = array('i', [-1]) * adj.size
+    parent_f[source], parent_b[target] = source, target
+    if source == target:
+        return parent_f, 1
+    front_f, front_b = [source], [target]
+    nodes_explored = 0
+    while front_f and front_b:
+        if len(front_f) <= len(front_b):
+            front, parent, other = front_f, parent_f, parent_b
+        else:
+            front, parent, other = front_b, parent_b, parent_f
+        layer = []
+        push = layer.append
+        for u in front:
+            nodes_explored += 1
+            if on_expand:
+                on_expand(u)
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                if parent[v] < 0:
+                    parent[v] = u
+                    push(v)
+                    if on_push:
+                        on_push(v, u)
+                    if other[v] >= 0:
+                        return _splice_backward(parent_f, parent_b, v, target), nodes_explored
+        if parent is parent_f:
+            front_f = layer
+        else:
+            front_b = layer
+    return None, nodes_explored
+
+
+def _bidirectional_astar_flat(adj: Adjacency, source: int, target: int,
+                              on_expand=None, on_push=None, h_f=None, h_b=None):
+    """A* simultáneo desde start y desde goal con potenciales promediados.
+
+    Con p(v) = h_f(v) - h_b(v) (heurística hacia goal menos heurística
+    hacia start), el lado directo ordena por 2*g + p y el inverso por
+    2*g - p; así ambas búsquedas son consistentes entre sí y se puede parar
+    en cuanto la suma de las dos cimas alcanza 2*mu, siendo mu el mejor
+    camino encontrado. h_f y h_b reciben índices planos y devuelven
+    enteros; sin ellas se usa Manhattan hacia goal y hacia start.
+    """
+    offsets, targets, size, cols = adj.offsets, adj.targets, adj.size, adj.cols
+    if h_f is None and h_b is None:
+        gy, gx = divmod(target, cols)
+        sy, sx = divmod(source, cols)
+
+        def potential(v):
+            y, x = v // cols, v % cols
+            return abs(y - gy) + abs(x - gx) - abs(y - sy) - abs(x - sx)
+    else:
+        potential = lambda v: h_f(v) - h_b(v)
+    parent_f = array('i', [-1]) * size
+    parent_b = array('i', [-1]) * size
+    g_f = array('i', [-1]) * size
+    g_b = array('i', [-1]) * size
+    closed_f, closed_b = bytearray(size), bytearray(size)
+    parent_f[source], parent_b[target] = source, target
+    g_f[source] = g_b[target] = 0
+    heap_f, heap_b = [potential(source) * size + source], [-potential(target) * size + target]
+    pop, push = heapq.heappop, heapq.heappush
+    mu, meet = (0, source) if source == target else (-1, -1)
+    nodes_explored = 0
+    while heap_f and heap_b:
+        top_f, top_b = heap_f[0] // size, heap_b[0] // size
+        if mu >= 0 and 2 * mu <= top_f + top_b:
+            break
+        if top_f <= top_b:
+            heap, closed, g_score, parent, sign = heap_f, closed_f, g_f, parent_f, 1
+            other_g = g_b
+        else:
+            heap, closed, g_score, parent, sign = heap_b, closed_b, g_b, parent_b, -1
+            other_g = g_f
+        u = pop(heap) % size
+        if closed[u]:
+            continue
+        closed[u] = 1
         nodes_explored += 1
-        if current == goal:
-            return reconstruct_path(parent, start, goal), nodes_explored
-        for dy, dx in directions:
-            ny, nx = current[0] + dy, current[1] + dx
-            if 0 <= ny < rows and 0 <= nx < cols and not visited[ny][nx] and grid[ny][nx] == 0:
-                visited[ny][nx] = True
-                parent[(ny, nx)] = current
-                stack.append((ny, nx))
-    return [], nodes_explored
+        if on_expand:
+            on_expand(u)
+        new_g = g_score[u] + 1
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            g = g_score[v]
+            if g < 0 or new_g < g:
+                g_score[v] = new_g
+                parent[v] = u
+                push(heap, (2 * new_g + sign * potential(v)) * size + v)
+                if on_push:
+                    on_push(v, u)
+                if other_g[v] >= 0 and (mu < 0 or new_g + other_g[v] < mu):
+                    mu, meet = new_g + other_g[v], v
+    if meet < 0:
+        return None, nodes_explored
+    return _splice_backward(parent_f, parent_b, meet, target), nodes_explored
 
 
-def uniform_cost_search(
-    grid: List[List[int]],
-    start: Tuple[int, int],
-    goal: Tuple[int, int]
-) -> Tuple[List[Tuple[int, int]], int]:
-    rows, cols = len(grid), len(grid[0])
-    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
-    g_score: Dict[Tuple[int, int], int] = {start: 0}
-    visited = set()
-    heap = [(0, start)]
+# Modo compacto: en lugar de la lista de adyacencia y de arreglos de 4 bytes
+# por celda, se usa un bit de visitado y 2 bits con la dirección de llegada
+# por celda (arriba, abajo, izquierda, derecha), y los vecinos se leen
+# directamente del grid.
+
+def _neighbours(data, size: int, cols: int, u: int):
+    """Vecinos libres de u con el código de la dirección del movimiento"""
+    x = u % cols
+    if u >= cols and data[u - cols] == 0:
+        yield u - cols, 0
+    if u + cols < size and data[u + cols] == 0:
+        yield u + cols, 1
+    if x > 0 and data[u - 1] == 0:
+        yield u - 1, 2
+    if x < cols - 1 and data[u + 1] == 0:
+        yield u + 1, 3
+
+
+def _bfs_compact(grid: MazeGrid, source: int, target: int, seen, dirs, on_expand=None, on_push=None):
+    # Solo se guardan la capa actual y la siguiente, no la cola completa
+    data, size, cols = grid.data, len(grid.data), grid.cols
+    seen[source >> 3] |= 1 << (source & 7)
+    layer = [source]
     nodes_explored = 0
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    while layer:
+        nxt = []
+        for u in layer:
+            nodes_explored += 1
+            if on_expand:
+                on_expand(u)
+            if u == target:
+                return True, nodes_explored
+            for v, d in _neighbours(data, size, cols, u):
+                if not seen[v >> 3] >> (v & 7) & 1:
+                    seen[v >> 3] |= 1 << (v & 7)
+                    dirs[v >> 2] |= d << ((v & 3) << 1)
+                    nxt.append(v)
+                    if on_push:
+                        on_push(v, u)
+        layer = nxt
+    return False, nodes_explored
+
+
+def _dfs_compact(grid: MazeGrid, source: int, target: int, seen, dirs, on_expand=None, on_push=None):
+    data, size, cols = grid.data, len(grid.data), grid.cols
+    seen[source >> 3] |= 1 << (source & 7)
+    stack = [source]
+    nodes_explored = 0
+    while stack:
+        u = stack.pop()
+        nodes_explored += 1
+        if on_expand:
+            on_expand(u)
+        if u == target:
+            return True, nodes_explored
+        for v, d in _neighbours(data, size, cols, u):
+            if not seen[v >> 3] >> (v & 7) & 1:
+                seen[v >> 3] |= 1 << (v & 7)
+                dirs[v >> 2] |= d << ((v & 3) << 1)
+                stack.append(v)
+                if on_push:
+                    on_push(v, u)
+    return False, nodes_explored
+
+
+def _astar_compact(grid: MazeGrid, source: int, target: int, seen, dirs,
+                   on_expand=None, on_push=None, h=None, packed=False):
+    """UCS o A* sin g_score ni padres por celda; sin h usa Manhattan hacia target.
 
+    Con Manhattan, o con una h entera y packed=True (la h nula de UCS), las
+    entradas del heap son la clave de _astar_flat (o de _ucs_flat)
+    multiplicada por 4 más la dirección; con una h propia son tuplas
+    (f, celda*4 + dirección). En ambos casos el orden de expansión es el
+    mismo que en _astar_flat o _ucs_flat (la UCS normal usa cubetas y
+    desempata en otro orden, con el mismo coste de camino). g no se
+    guarda: con una heurística consistente es f - h(celda). La dirección
+    de llegada y el bit de cerrado se escriben al sacar la celda del heap.
+    """
+    data, size, cols = grid.data, len(grid.data), grid.cols
+    span = grid.rows + cols
+    if h is None:
+        gy, gx = divmod(target, cols)
+        h = lambda v: abs(v // cols - gy) + abs(v % cols - gx)
+        packed = True
+    hs = h(source)
+    heap = [((hs * span + hs) * size + source) * 4 if packed else (hs, source * 4)]
+    pop, push = heapq.heappop, heapq.heappush
+    nodes_explored = 0
     while heap:
-        cost, current = heapq.heappop(heap)
-        if current in visited:
+        if packed:
+            entry = pop(heap)
+            key, u = divmod(entry >> 2, size)
+            f = key // span
+        else:
+            f, entry = pop(heap)
+            u = entry >> 2
+        if seen[u >> 3] >> (u & 7) & 1:
+            continue
+        seen[u >> 3] |= 1 << (u & 7)
+        if u != source:
+            dirs[u >> 2] |= (entry & 3) << ((u & 3) << 1)
+        nodes_explored += 1
+        if on_expand:
+            on_expand(u)
+        if u == target:
+            return True, nodes_explored
+        new_g = (f - h(u) if packed else round(f - h(u))) + 1
+        for v, d in _neighbours(data, size, cols, u):
+            if not seen[v >> 3] >> (v & 7) & 1:
+                hv = h(v)
+                if packed:
+                    push(heap, (((new_g + hv) * span + hv) * size + v) * 4 + d)
+                else:
+                    push(heap, (new_g + hv, v * 4 + d))
+                if on_push:
+                    on_push(v, u)
+    return False, nodes_explored
+
+
+def _compact_path(dirs, source: int, target: int, cols: int) -> List[Tuple[int, int]]:
+    back = (cols, -cols, 1, -1)  # de la celda a su padre según la dirección de llegada
+    path: List[Tuple[int, int]] = []
+    v = target
+    while v != source:
+        path.append(divmod(v, cols))
+        v += back[dirs[v >> 2] >> ((v & 3) << 1) & 3]
+    path.append(divmod(source, cols))
+    path.reverse()
+    return path
+
+
+def _run_compact(kernel, grid: Grid, start, goal, observer=None, **kwargs):
+    grid = as_grid(grid)
+    cols, size = grid.cols, grid.rows * grid.cols
+    source, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+    if observer is not None:
+        kwargs["on_expand"] = lambda u: observer.on_expand(divmod(u, cols))
+        kwargs["on_push"] = lambda v, u: observer.on_push(divmod(v, cols), divmod(u, cols))
+    seen, dirs = bytearray((size + 7) >> 3), bytearray((size + 3) >> 2)
+    found, nodes_explored = kernel(grid, source, target, seen, dirs, **kwargs)
+    if not found:
+        return [], nodes_explored
+    return _compact_path(dirs, source, target, cols), nodes_explored
+
+
+# Terreno con costes: el laberinto sigue indicando solo las paredes (para
+# todos los algoritmos una celda distinta de 0 es pared) y un mapa aparte,
+# con las mismas dimensiones, da el coste entero de entrar en cada celda
+# (0 cuenta como 1). Sin mapa de costes todos los pasos cuestan 1.
+
+DIAL_MAX_COST = 255  # Con costes mayores, las cubetas vacías pesan más que el heap
+
+
+def _cost_array(costs: Grid, grid: MazeGrid):
+    """Mapa de costes como secuencia plana indexada como el laberinto, y su máximo"""
+    if isinstance(costs, MazeGrid):
+        rows, cols, flat = costs.rows, costs.cols, costs.data
+    elif np is not None and isinstance(costs, np.ndarray):
+        rows, cols = costs.shape
+        flat = array('i', costs.astype(np.int32).tobytes())
+    else:
+        rows, cols = len(costs), len(costs[0]) if len(costs) else 0
+        flat = array('i', [c for row in costs for c in row])
+    if (rows, cols) != (grid.rows, grid.cols) or len(flat) != grid.rows * grid.cols:
+        raise ValueError("El mapa de costes no tiene las dimensiones del laberinto")
+    if len(flat) and min(flat) < 0:
+        raise ValueError("Los costes no pueden ser negativos")
+    return flat, max(max(flat, default=1), 1)
+
+
+def _check_costs_mode(compact: bool):
+    if compact:
+        raise ValueError("El modo compacto no admite mapa de costes (costs)")
+
+
+def _check_indexed_mode(compact: bool):
+    if compact:
+        raise ValueError("El modo compacto no admite heap indexado (indexed)")
+
+
+def _dial_flat(adj: Adjacency, source: int, target: int, on_expand=None, on_push=None, h=None,
+               costs=None, bound: int = 1):
+    """UCS (sin h) o A* con Manhattan con cola de cubetas (algoritmo de Dial).
+
+    Con costes enteros acotados por bound, la clave g + h de un vecino
+    supera a la de la celda expandida como mucho en bound + 1 (el coste del
+    paso más lo que h puede cambiar en un paso, que con Manhattan es 1), así
+    que las claves pendientes están siempre en [k, k + bound + 1] y basta un
+    anillo de bound + 2 cubetas: insertar y sacar son O(1) y no hay tuplas
+    ni heap. Una h que cambie más de 1 por paso (aunque sea consistente)
+    desbordaría el anillo, por eso solo se admite Manhattan. Sin costs
+    cada paso cuesta 1.
+    """
+    offsets, targets, size = adj.offsets, adj.targets, adj.size
+    width = bound + 2
+    buckets: List[List[int]] = [[] for _ in range(width)]
+    parent = array('i', [-1]) * size
+    g_score = array('i', [-1]) * size
+    closed = bytearray(size)
+    parent[source], g_score[source] = source, 0
+    key = h(source) if h else 0
+    buckets[key % width].append(source)
+    pending = 1
+    nodes_explored = 0
+    while pending:
+        bucket = buckets[key % width]
+        if not bucket:
+            key += 1
+            continue
+        u = bucket.pop()
+        pending -= 1
+        if closed[u]:
             continue
-        visited.add(current)
+        closed[u] = 1
         nodes_explored += 1
-        if current == goal:
-            return reconstruct_path(parent, start, goal), nodes_explored
-        for dy, dx in directions:
-            ny, nx = current[0] + dy, current[1] + dx
-            neighbor = (ny, nx)
-            if 0 <= ny < rows and 0 <= nx < cols and grid[ny][nx] == 0:
-                new_cost = cost + 1
-                if neighbor not in g_score or new_cost < g_score[neighbor]:
-                    g_score[neighbor] = new_cost
-                    parent[neighbor] = current
-                    heapq.heappush(heap, (new_cost, neighbor))
-    return [], nodes_explored
+        if on_expand:
+            on_expand(u)
+        if u == target:
+            return parent, nodes_explored
+        g = g_score[u]
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if closed[v]:
+                continue
+            new_g = g + (costs[v] or 1 if costs is not None else 1)
+            old = g_score[v]
+            if old < 0 or new_g < old:
+                g_score[v], parent[v] = new_g, u
+                buckets[(new_g + h(v) if h else new_g) % width].append(v)
+                pending += 1
+                if on_push:
+                    on_push(v, u)
+    return None, nodes_explored
+
+
+def path_cost(costs: Grid, path: List[Tuple[int, int]]) -> int:
+    """Coste de recorrer path según el mapa de costes (la celda inicial no cuenta)"""
+    return sum(int(costs[y][x]) or 1 for y, x in path[1:])
+
+
+def _flat_path(parent, source: int, target: int, cols: int) -> List[Tuple[int, int]]:
+    path: List[Tuple[int, int]] = []
+    v = target
+    while v != source:
+        path.append(divmod(v, cols))
+        v = parent[v]
+    path.append(divmod(source, cols))
+    path.reverse()
+    return path
+
+
+def _run_flat(kernel, grid: Grid, start, goal, observer=None, **kwargs):
+    grid = as_grid(grid)
+    cols = grid.cols
+    source, target = start[0] * cols + start[1], goal[0] * cols + goal[1]
+    if observer is not None:
+        kwargs["on_expand"] = lambda u: observer.on_expand(divmod(u, cols))
+        kwargs["on_push"] = lambda v, u: observer.on_push(divmod(v, cols), divmod(u, cols))
+    parent, nodes_explored = kernel(adjacency(grid), source, target, **kwargs)
+    if parent is None:
+        return [], nodes_explored
+    return _flat_path(parent, source, target, cols), nodes_explored
+
+
+# Con compact=True las búsquedas usan el modo compacto: unos 3 bits por
+# celda además del grid y de la frontera, a cambio de ser algo más lentas.
+# Con un mapa de costes (costs), UCS y A* usan el coste de cada celda del
+# terreno; el modo compacto solo admite costes unitarios, así que pedir
+# ambos es un error
+
+def bfs(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    observer: Optional[SearchObserver] = None,
+    compact: bool = False
+) -> Tuple[List[Tuple[int, int]], int]:
+    if compact:
+        return _run_compact(_bfs_compact, grid, start, goal, observer)
+    return _run_flat(_bfs_flat, grid, start, goal, observer)
+
+
+def dfs(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    observer: Optional[SearchObserver] = None,
+    compact: bool = False
+) -> Tuple[List[Tuple[int, int]], int]:
+    if compact:
+        return _run_compact(_dfs_compact, grid, start, goal, observer)
+    return _run_flat(_dfs_flat, grid, start, goal, observer)
+
+
+def uniform_cost_search(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    observer: Optional[SearchObserver] = None,
+    compact: bool = False,
+    costs: Optional[Grid] = None,
+    indexed: bool = False
+) -> Tuple[List[Tuple[int, int]], int]:
+    grid = as_grid(grid)
+    if indexed:
+        _check_indexed_mode(compact)
+        if costs is not None:
+            costs, _ = _cost_array(costs, grid)
+        return _run_flat(_astar_indexed, grid, start, goal, observer, h=lambda v: 0, costs=costs)
+    if costs is not None:
+        _check_costs_mode(compact)
+        costs, bound = _cost_array(costs, grid)
+        if bound > DIAL_MAX_COST:
+            return _run_flat(_ucs_flat, grid, start, goal, observer, costs=costs)
+        return _run_flat(_dial_flat, grid, start, goal, observer, costs=costs, bound=bound)
+    if compact:
+        return _run_compact(_astar_compact, grid, start, goal, observer, h=lambda v: 0, packed=True)
+    return _run_flat(_dial_flat, grid, start, goal, observer)
 
 
 def astar(
-    grid: List[List[int]],
+    grid: Grid,
     start: Tuple[int, int],
     goal: Tuple[int, int],
-    heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float]
+    heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float],
+    observer: Optional[SearchObserver] = None,
+    compact: bool = False,
+    costs: Optional[Grid] = None,
+    indexed: bool = False
 ) -> Tuple[List[Tuple[int, int]], int]:
-    rows, cols = len(grid), len(grid[0])
-    open_heap: List[Tuple[float, Tuple[int, int]]] = []
-    g_score: Dict[Tuple[int, int], float] = {start: 0}
-    f_score: Dict[Tuple[int, int], float] = {start: heuristic(start, goal)}
-    parent: Dict[Tuple[int, int], Tuple[int, int]] = {}
-    visited = set()
-    nodes_explored = 0
-    directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+    grid = as_grid(grid)
+    cols = grid.cols
+    h = None
+    if heuristic is not manhattan:
+        h = lambda v: heuristic(divmod(v, cols), goal)
+    if indexed:
+        _check_indexed_mode(compact)
+        if costs is not None:
+            costs, _ = _cost_array(costs, grid)
+        return _run_flat(_astar_indexed, grid, start, goal, observer, h=h, costs=costs)
+    if costs is not None:
+        _check_costs_mode(compact)
+        # Manhattan sigue siendo admisible: ningún paso cuesta menos de 1
+        costs, bound = _cost_array(costs, grid)
+        # El anillo de cubetas solo está acotado para Manhattan (ver
+        # _dial_flat); las heurísticas propias y los costes grandes van al heap
+        if h is not None or bound > DIAL_MAX_COST:
+            return _run_flat(_astar_flat, grid, start, goal, observer, h=h, costs=costs)
+        gy, gx = goal
+        h = lambda v: abs(v // cols - gy) + abs(v % cols - gx)
+        return _run_flat(_dial_flat, grid, start, goal, observer, h=h, costs=costs, bound=bound)
+    if compact:
+        return _run_compact(_astar_compact, grid, start, goal, observer, h=h)
+    return _run_flat(_astar_flat, grid, start, goal, observer, h=h)
 
-    heapq.heappush(open_heap, (f_score[start], start))
 
-    while open_heap:
-        current_f, current = heapq.heappop(open_heap)
-        if current in visited:
-            continue
-        visited.add(current)
-        nodes_explored += 1
-        if current == goal:
-            return reconstruct_path(parent, start, goal), nodes_explored
-        for dy, dx in directions:
-            ny, nx = current[0] + dy, current[1] + dx
-            neighbor = (ny, nx)
-            if 0 <= ny < rows and 0 <= nx < cols and grid[ny][nx] == 0:
-                tentative_g = g_score[current] + 1
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    g_score[neighbor] = tentative_g
-                    f_score[neighbor] = tentative_g + heuristic(neighbor, goal)
-                    parent[neighbor] = current
-                    heapq.heappush(open_heap, (f_score[neighbor], neighbor))
-    return [], nodes_explored
+def bidirectional_bfs(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    observer: Optional[SearchObserver] = None
+) -> Tuple[List[Tuple[int, int]], int]:
+    return _run_flat(_bidirectional_bfs_flat, grid, start, goal, observer)
+
+
+def bidirectional_astar(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    heuristic: Callable[[Tuple[int, int], Tuple[int, int]], float],
+    observer: Optional[SearchObserver] = None
+) -> Tuple[List[Tuple[int, int]], int]:
+    h_f = h_b = None
+    if heuristic is not manhattan:
+        cols = as_grid(grid).cols
+        h_f = lambda v: int(heuristic(divmod(v, cols), goal))
+        h_b = lambda v: int(heuristic(divmod(v, cols), start))
+    return _run_flat(_bidirectional_astar_flat, grid, start, goal, observer, h_f=h_f, h_b=h_b)
+
+
+def wavefront_bfs(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int]
+) -> Tuple[List[Tuple[int, int]], int]:
+    """BFS vectorizado con NumPy.
+
+    Cada paso dilata el frente completo de una vez: desplaza sus índices
+    planos en ±1 fila y ±1 columna sobre una máscara de celdas libres
+    rodeada de paredes (sin comprobar bordes) y etiqueta las celdas nuevas
+    con su distancia a start. El camino se recupera descendiendo por el
+    campo de distancias desde goal. nodes_explored cuenta las celdas
+    alcanzadas por el frente.
+    """
+    if np is None:
+        return bfs(grid, start, goal)
+    grid = as_grid(grid)
+    rows, cols = grid.rows, grid.cols
+    width = cols + 2
+    unvisited = np.zeros((rows + 2, width), dtype=bool)
+    unvisited[1:-1, 1:-1] = grid.to_numpy() == 0
+    unvisited = unvisited.ravel()
+    dist = np.full(unvisited.size, -1, dtype=np.int32)
+    source = (start[0] + 1) * width + start[1] + 1
+    target = (goal[0] + 1) * width + goal[1] + 1
+    shifts = np.array([-width, width, -1, 1])
+
+    frontier = np.array([source])
+    dist[source] = 0
+    unvisited[source] = False
+    nodes_explored = 1
+    step = 0
+    while dist[target] < 0:
+        grown = (frontier[:, None] + shifts).ravel()
+        grown = np.unique(grown[unvisited[grown]])
+        if grown.size == 0:
+            return [], nodes_explored
+        step += 1
+        dist[grown] = step
+        unvisited[grown] = False
+        nodes_explored += grown.size
+        frontier = grown
+
+    path = [goal]
+    cell = target
+    for d in range(step - 1, -1, -1):
+        for shift in (-width, width, -1, 1):
+            if dist[cell + shift] == d:
+                cell += shift
+                break
+        y, x = divmod(cell, width)
+        path.append((y - 1, x - 1))
+    path.reverse()
+    return path, nodes_explored
+
+
+def _bfs_tree_flat(adj: Adjacency, source: int, goals: set):
+    """BFS desde source que termina cuando se han expandido todas las metas.
+
+    Devuelve el arreglo de padres y, para cada meta alcanzada, el número de
+    nodos expandidos al llegar a ella (lo mismo que contaría _bfs_flat).
+    """
+    offsets, targets = adj.offsets, adj.targets
+    parent = array('i', [-1]) * adj.size
+    parent[source] = source
+    pending = set(goals)
+    settled: Dict[int, int] = {}
+    queue = [source]
+    push = queue.append
+    for nodes_explored, u in enumerate(queue, 1):
+        if u in pending:
+            settled[u] = nodes_explored
+            pending.discard(u)
+            if not pending:
+                break
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            if parent[v] < 0:
+                parent[v] = u
+                push(v)
+    return parent, settled, len(queue) if pending else None
+
+
+def batch_search(
+    grid: Grid,
+    pairs: List[Tuple[Tuple[int, int], Tuple[int, int]]]
+) -> List[Tuple[List[Tuple[int, int]], int]]:
+    """Caminos mínimos para muchos pares (start, goal) compartiendo búsquedas.
+
+    Los pares se agrupan por start y se hace un único árbol BFS por start
+    que se detiene cuando todas sus metas están resueltas. El resultado de
+    cada par, en el mismo orden que pairs, es el que daría bfs(grid, start, goal).
+    """
+    grid = as_grid(grid)
+    adj = adjacency(grid)
+    cols = grid.cols
+    by_source: Dict[int, List[int]] = {}
+    for k, (start, goal) in enumerate(pairs):
+        by_source.setdefault(start[0] * cols + start[1], []).append(k)
+
+    results: List[Tuple[List[Tuple[int, int]], int]] = [None] * len(pairs)
+    for source, indices in by_source.items():
+        goals = {pairs[k][1][0] * cols + pairs[k][1][1] for k in indices}
+        parent, settled, exhausted = _bfs_tree_flat(adj, source, goals)
+        for k in indices:
+            target = pairs[k][1][0] * cols + pairs[k][1][1]
+            if target in settled:
+                results[k] = (_flat_path(parent, source, target, cols), settled[target])
+            else:
+                results[k] = ([], exhausted)
+    return results
 
 
 def reconstruct_path(
@@ -148,6 +925,37 @@ def reconstruct_path(
 def manhattan(a: Tuple[int, int], b: Tuple[int, int]) -> float:
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
+
+def astar_manhattan(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    observer: Optional[SearchObserver] = None,
+    compact: bool = False,
+    costs: Optional[Grid] = None
+) -> Tuple[List[Tuple[int, int]], int]:
+    return astar(grid, start, goal, manhattan, observer, compact, costs)
+
+
+def bidirectional_astar_manhattan(
+    grid: Grid,
+    start: Tuple[int, int],
+    goal: Tuple[int, int],
+    observer: Optional[SearchObserver] = None
+) -> Tuple[List[Tuple[int, int]], int]:
+    return bidirectional_astar(grid, start, goal, manhattan, observer)
+
+
+# Algoritmos seleccionables por clave: (nombre visible, función)
+ALGORITHMS: Dict[str, Tuple[str, Callable]] = {
+    "bfs": ("BFS", bfs),
+    "dfs": ("DFS", dfs),
+    "ucs": ("UCS", uniform_cost_search),
+    "astar": ("A*", astar_manhattan),
+    "bibfs": ("BFS bidireccional", bidirectional_bfs),
+    "biastar": ("A* bidireccional", bidirectional_astar_manhattan),
+}
+
 if __name__ == "__main__":
     sample = [
         [0, 1, 0, 0],
@@ -171,3 +979,15 @@ if __name__ == "__main__":
     path_astar, exp_astar = astar(sample, s, e, manhattan)
     print("A* Path:", path_astar)
     print("A* Nodes explored:", exp_astar)
+
+    path_bibfs, exp_bibfs = bidirectional_bfs(sample, s, e)
+    print("Bidirectional BFS Path:", path_bibfs)
+    print("Bidirectional BFS Nodes explored:", exp_bibfs)
+
+    path_biastar, exp_biastar = bidirectional_astar(sample, s, e, manhattan)
+    print("Bidirectional A* Path:", path_biastar)
+    print("Bidirectional A* Nodes explored:", exp_biastar)
+
+    path_wave, exp_wave = wavefront_bfs(sample, s, e)
+    print("Wavefront Path:", path_wave)
+    print("Wavefront Nodes explored:", exp_wave)
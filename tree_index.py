@@ -0,0 +1,138 @@
+from array import array
+from typing import List, Tuple
+
+from maze_grid import FingerprintCache, Grid, as_grid
+from search import adjacency
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional; solo acelera la construcción de las tablas
+    np = None
+
+
+class TreeIndex:
+    """Oráculo de caminos para laberintos perfectos (Kruskal y Prim).
+
+    Un laberinto perfecto es un árbol: entre dos celdas hay un único camino.
+    El índice enraíza cada componente, guarda la profundidad de cada celda
+    y tablas de binary lifting (ancestro 2^k), de modo que la longitud del
+    camino se responde en O(log n) con el ancestro común más bajo (LCA) y
+    el camino completo en O(longitud), sin búsqueda. Solo vale antes de que
+    ensure_connectivity u otro cambio abra ciclos.
+    """
+
+    def __init__(self, grid: Grid):
+        grid = as_grid(grid)
+        adj = adjacency(grid)
+        offsets, targets = adj.offsets, adj.targets
+        data, size = grid.data, adj.size
+        self.cols = grid.cols
+
+        # Identificadores compactos para las celdas libres
+        self.id_of = array('i', [-1]) * size
+        self.cells = array('i')
+        for i in range(size):
+            if data[i] == 0:
+                self.id_of[i] = len(self.cells)
+                self.cells.append(i)
+        n = len(self.cells)
+        id_of, cells = self.id_of, self.cells
+
+        parent = array('i', [-1]) * n
+        depth = array('i', [0]) * n
+        component = array('i', [-1]) * n
+        for root in range(n):
+            if component[root] >= 0:
+                continue
+            component[root], parent[root] = root, root
+            queue = [root]
+            for u in queue:
+                pu = parent[u]
+                cell = cells[u]
+                for k in range(offsets[cell], offsets[cell + 1]):
+                    v = id_of[targets[k]]
+                    if v == pu and u != root:
+                        continue
+                    if component[v] >= 0:
+                        raise ValueError("El laberinto no es perfecto: contiene ciclos")
+                    component[v], parent[v], depth[v] = root, u, depth[u] + 1
+                    queue.append(v)
+        self.parent, self.depth, self.component = parent, depth, component
+
+        # up[k][v] es el ancestro 2^k de v (la raíz es su propio ancestro)
+        levels = max(max(depth, default=0).bit_length(), 1)
+        self.up: List[array] = [parent]
+        if np is not None:
+            prev = np.frombuffer(parent, dtype=np.int32)
+            for _ in range(1, levels):
+                prev = prev[prev]
+                self.up.append(array('i', prev.tobytes()))
+        else:
+            for _ in range(1, levels):
+                prev = self.up[-1]
+                self.up.append(array('i', [prev[prev[v]] for v in range(n)]))
+
+    def _id(self, cell: Tuple[int, int]) -> int:
+        node = self.id_of[cell[0] * self.cols + cell[1]]
+        if node < 0:
+            raise ValueError(f"La celda {cell} es una pared")
+        return node
+
+    def _lca(self, a: int, b: int) -> int:
+        depth, up = self.depth, self.up
+        if depth[a] < depth[b]:
+            a, b = b, a
+        diff = depth[a] - depth[b]
+        k = 0
+        while diff:
+            if diff & 1:
+                a = up[k][a]
+            diff >>= 1
+            k += 1
+        if a == b:
+            return a
+        for k in range(len(up) - 1, -1, -1):
+            if up[k][a] != up[k][b]:
+                a, b = up[k][a], up[k][b]
+        return self.parent[a]
+
+    def lca(self, a: Tuple[int, int], b: Tuple[int, int]):
+        """Ancestro común más bajo de a y b, o None si están en componentes distintas"""
+        u, v = self._id(a), self._id(b)
+        if self.component[u] != self.component[v]:
+            return None
+        return divmod(self.cells[self._lca(u, v)], self.cols)
+
+    def distance(self, start: Tuple[int, int], goal: Tuple[int, int]) -> int:
+        """Número de pasos entre start y goal, o -1 si no están conectados"""
+        u, v = self._id(start), self._id(goal)
+        if self.component[u] != self.component[v]:
+            return -1
+        depth = self.depth
+        return depth[u] + depth[v] - 2 * depth[self._lca(u, v)]
+
+    def path(self, start: Tuple[int, int], goal: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """Único camino de start a goal, o [] si no están conectados"""
+        u, v = self._id(start), self._id(goal)
+        if self.component[u] != self.component[v]:
+            return []
+        top = self._lca(u, v)
+        parent, cells, cols = self.parent, self.cells, self.cols
+        up_part, down_part = [], []
+        while u != top:
+            up_part.append(divmod(cells[u], cols))
+            u = parent[u]
+        while v != top:
+            down_part.append(divmod(cells[v], cols))
+            v = parent[v]
+        up_part.append(divmod(cells[top], cols))
+        down_part.reverse()
+        return up_part + down_part
+
+
+_index_cache = FingerprintCache(TreeIndex)
+
+
+def tree_index(grid: Grid) -> TreeIndex:
+    """Índice del laberinto perfecto, cacheado por la huella de su contenido"""
+    return _index_cache.get(as_grid(grid))
@@ -1,11 +1,15 @@
 import pygame
 import sys
-from typing import List, Tuple, Set
+from typing import Iterable, List, Tuple
+from animation import FrameScheduler
+from maze_grid import Grid, as_grid
 
 # Constantes
 CELL_SIZE = 8  # Tamaño de celda en píxeles (reducido para que quepa un laberinto más grande)
-DELAY_EXPLORATION = 0  # Milisegundos entre la visualización de cada nodo explorado
-DELAY_PATH = 10  # Milisegundos entre la visualización de cada paso del camino
+FPS = 60  # Frames por segundo de la animación
+EXPLORED_PER_FRAME = 50  # Nodos explorados dibujados por frame
+PATH_STEPS_PER_FRAME = 2  # Pasos del camino dibujados por frame
+MAX_ANIMATION_S = 10  # Duración máxima de cada fase de la animación en segundos
 
 # Colores
 BLACK = (0, 0, 0)         # Pared
@@ -17,6 +21,11 @@ YELLOW = (255, 255, 0)    # Nodos explorados
 GRAY = (200, 200, 200)    # Frontera (si se usa Prim)
 ORANGE = (255, 165, 0)    # Color alternativo
 
+# Paleta de los búferes de celdas: los índices 0, 1 y 2 coinciden con los
+# valores del laberinto y los siguientes son las capas de la exploración
+LAYER_EXPLORED, LAYER_PATH, LAYER_START, LAYER_GOAL = 3, 4, 5, 6
+PALETTE = [WHITE, BLACK, GRAY, YELLOW, ORANGE, RED, GREEN]
+
 def initialize_pygame(rows: int, cols: int):
     """Inicializa pygame y devuelve la superficie de dibujo"""
     pygame.init()
@@ -25,46 +34,60 @@ def initialize_pygame(rows: int, cols: int):
     pygame.display.set_caption("Resolución de Laberinto")
     return screen
 
+def cell_buffer(
+    area: Grid,
+    explored: Iterable[Tuple[int, int]] = (),
+    path: Iterable[Tuple[int, int]] = (),
+    start: Tuple[int, int] = None,
+    goal: Tuple[int, int] = None
+) -> bytearray:
+    """Copia de las celdas con las capas de exploración escritas como índices de paleta"""
+    area = as_grid(area)
+    cols = area.cols
+    buf = bytearray(area.data)
+    for layer, cells in ((LAYER_EXPLORED, explored), (LAYER_PATH, path)):
+        for y, x in cells:
+            buf[y*cols + x] = layer
+    if start is not None:
+        buf[start[0]*cols + start[1]] = LAYER_START
+    if goal is not None:
+        buf[goal[0]*cols + goal[1]] = LAYER_GOAL
+    return buf
+
+def blit_cells(surface, buf, rows: int, cols: int, cell_size: int = CELL_SIZE):
+    """Dibuja un búfer de índices de paleta (una celda por byte) escalado en un solo blit"""
+    cells = pygame.image.frombuffer(buf, (cols, rows), "P")
+    cells.set_palette(PALETTE)
+    surface.blit(pygame.transform.scale(cells, (cols*cell_size, rows*cell_size)), (0, 0))
+
 def visualize_exploration(
     screen, 
-    area: List[List[int]], 
+    area: Grid, 
     start: Tuple[int, int], 
     goal: Tuple[int, int], 
-    explored: Set[Tuple[int, int]],
+    explored: Iterable[Tuple[int, int]],
     path: List[Tuple[int, int]]
 ):
     """Visualiza la exploración y el camino encontrado"""
     # Dibujar el laberinto base
-    for y in range(len(area)):
-        for x in range(len(area[0])):
-            v = area[y][x]
-            if v == 1:
-                color = BLACK
-            elif v == 0:
-                color = WHITE
-            else:
-                color = GRAY
-            rect = pygame.Rect(x*CELL_SIZE, y*CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, color, rect)
+    area = as_grid(area)
+    blit_cells(screen, area.data, area.rows, area.cols)
     pygame.display.flip()
     
-    # Dibujar nodos explorados
-    count = 0
-    for y, x in explored:
-        if (y, x) != start and (y, x) != goal and (y, x) not in path:
-            rect = pygame.Rect(x*CELL_SIZE, y*CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, YELLOW, rect)
-            count += 1
-            if count % 50 == 0:  # Actualizar cada 50 nodos para acelerar la visualización
-                pygame.display.flip()
-                pygame.time.delay(DELAY_EXPLORATION)
-                # Manejar eventos para permitir salir
-                for evt in pygame.event.get():
-                    if evt.type == pygame.QUIT:
-                        pygame.quit()
-                        sys.exit()
+    # Dibujar nodos explorados (si hay muchos, más por frame para no pasar de MAX_ANIMATION_S)
+    skip = set(path)
+    skip.add(start)
+    skip.add(goal)
+    def fill_explored(cell):
+        if cell not in skip:
+            screen.fill(YELLOW, (cell[1]*CELL_SIZE, cell[0]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
     
-    pygame.display.flip()
+    scheduler = FrameScheduler(FPS, MAX_ANIMATION_S)
+    total = len(explored) if hasattr(explored, '__len__') else None
+    if not scheduler.run(explored, fill_explored, pygame.display.flip,
+                         per_frame=EXPLORED_PER_FRAME, total=total):
+        pygame.quit()
+        sys.exit()
     pygame.time.delay(300)  # Pausa para apreciar la exploración completa
     
     # Verificar si se encontró un camino
@@ -81,18 +104,14 @@ def visualize_exploration(
     # Dibujar camino encontrado
     print(f"Camino encontrado con longitud: {len(path)}")
     
-    # Crear un camino visual más grueso para que sea más visible
-    for y, x in path:
-        if (y, x) != start and (y, x) != goal:  # No dibujar sobre inicio y fin
-            rect = pygame.Rect(x*CELL_SIZE, y*CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, ORANGE, rect)
-            pygame.display.flip()
-            pygame.time.delay(DELAY_PATH)
-            # Manejar eventos para permitir salir
-            for evt in pygame.event.get():
-                if evt.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+    def fill_path(cell):
+        if cell != start and cell != goal:  # No dibujar sobre inicio y fin
+            screen.fill(ORANGE, (cell[1]*CELL_SIZE, cell[0]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
+    
+    if not scheduler.run(path, fill_path, pygame.display.flip,
+                         per_frame=PATH_STEPS_PER_FRAME, total=len(path)):
+        pygame.quit()
+        sys.exit()
     
     # Dibujar punto inicial y final
     start_rect = pygame.Rect(start[1]*CELL_SIZE, start[0]*CELL_SIZE, CELL_SIZE, CELL_SIZE)
@@ -101,19 +120,29 @@ def visualize_exploration(
     pygame.draw.rect(screen, GREEN, goal_rect)
     pygame.display.flip()
 
-def show_stats(screen, path_length, nodes_explored, algorithm_name):
-    """Muestra estadísticas en pantalla"""
-    try:
-        font = pygame.font.SysFont('Arial', 18)
-    except:
-        font = pygame.font.Font(None, 22)  # Fuente por defecto si Arial no está disponible
+_font = None
+
+def _stats_font():
+    """Fuente de las estadísticas (se crea una sola vez)"""
+    global _font
+    if _font is None:
+        pygame.font.init()
+        try:
+            _font = pygame.font.SysFont('Arial', 18)
+        except:
+            _font = pygame.font.Font(None, 22)  # Fuente por defecto si Arial no está disponible
+    return _font
+
+def draw_stats(surface, path_length, nodes_explored, algorithm_name):
+    """Dibuja el recuadro de estadísticas sobre surface sin actualizar la pantalla"""
+    font = _stats_font()
     
     # Crear un rectángulo para el fondo de las estadísticas
     stats_rect = pygame.Rect(10, 10, 300, 100)
     s = pygame.Surface((stats_rect.width, stats_rect.height))
     s.set_alpha(200)  # Semi-transparente
     s.fill((220, 220, 220))
-    screen.blit(s, stats_rect)
+    surface.blit(s, stats_rect)
     
     # Crear textos
     text1 = font.render(f"Algoritmo: {algorithm_name}", True, BLACK)
@@ -121,8 +150,56 @@ def show_stats(screen, path_length, nodes_explored, algorithm_name):
     text3 = font.render(f"Nodos explorados: {nodes_explored}", True, BLACK)
     
     # Posicionar textos
-    screen.blit(text1, (20, 20))
-    screen.blit(text2, (20, 45))
-    screen.blit(text3, (20, 70))
-    
-    pygame.display.flip()
\ No newline at end of file
+    surface.blit(text1, (20, 20))
+    surface.blit(text2, (20, 45))
+    surface.blit(text3, (20, 70))
+
+def show_stats(screen, path_length, nodes_explored, algorithm_name):
+    """Muestra estadísticas en pantalla"""
+    draw_stats(screen, path_length, nodes_explored, algorithm_name)
+    pygame.display.flip()
+
+
+class SnapshotRenderer:
+    """Renderizado sin ventana para exportar capturas en lote.
+
+    Dibuja sobre una única pygame.Surface reutilizada entre escenarios, sin
+    pantalla, sin pausas y sin animación. Las capturas se acumulan en
+    memoria y se escriben en disco con flush() (automáticamente cada
+    batch_size capturas).
+    """
+
+    def __init__(self, rows: int, cols: int, batch_size: int = 64):
+        self.rows, self.cols = rows, cols
+        self.surface = pygame.Surface((cols * CELL_SIZE, rows * CELL_SIZE))
+        self.batch_size = batch_size
+        self.pending: List[Tuple[str, pygame.Surface]] = []
+
+    def render(
+        self,
+        area: Grid,
+        start: Tuple[int, int],
+        goal: Tuple[int, int],
+        explored: Iterable[Tuple[int, int]],
+        path: List[Tuple[int, int]],
+        algorithm_name: str = None,
+        nodes_explored: int = 0
+    ) -> pygame.Surface:
+        """Dibuja el estado final de la exploración (lo mismo que visualize_exploration)"""
+        buf = cell_buffer(area, explored, path, start, goal)
+        blit_cells(self.surface, buf, self.rows, self.cols)
+        if algorithm_name is not None:
+            draw_stats(self.surface, len(path), nodes_explored, algorithm_name)
+        return self.surface
+
+    def snapshot(self, filename: str):
+        """Encola una copia de la superficie actual para escribirla en filename"""
+        self.pending.append((filename, self.surface.copy()))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Escribe en disco todas las capturas pendientes"""
+        for filename, surface in self.pending:
+            pygame.image.save(surface, filename)
+        self.pending.clear()